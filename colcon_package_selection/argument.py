@@ -2,6 +2,7 @@
 # Licensed under the Apache License, Version 2.0
 
 import argparse
+import math
 import re
 
 
@@ -37,3 +38,77 @@ def argument_valid_regex(value):
     except re.error as e:  # noqa: F841
         raise argparse.ArgumentTypeError(
             'must be a valid regex: {e}'.format_map(locals()))
+
+
+def argument_positive_float(value):
+    """
+    Check if an argument is a positive finite number.
+
+    Used as a ``type`` callback in ``add_argument()`` calls.
+    NaN and infinity are rejected since they would make every comparison
+    meaningless.
+
+    :param str value: The command line argument
+    :returns: The number
+    :raises argparse.ArgumentTypeError: if the value is not a positive finite
+      number
+    """
+    try:
+        value = float(value)
+    except ValueError:
+        value = None
+    if value is None or not math.isfinite(value) or value <= 0:
+        raise argparse.ArgumentTypeError('must be a positive number')
+    return value
+
+
+def argument_positive_int(value):
+    """
+    Check if an argument is a positive integer.
+
+    Used as a ``type`` callback in ``add_argument()`` calls.
+
+    :param str value: The command line argument
+    :returns: The integer
+    :raises argparse.ArgumentTypeError: if the value is not a positive
+      integer
+    """
+    try:
+        value = int(value)
+    except ValueError:
+        value = None
+    if value is None or value <= 0:
+        raise argparse.ArgumentTypeError('must be a positive integer')
+    return value
+
+
+def argument_layer_range(value):
+    """
+    Check if an argument is a valid range of topological layers.
+
+    Used as a ``type`` callback in ``add_argument()`` calls.
+    The range is either a single layer ``N`` or a range ``FROM:TO``
+    (inclusive) where either bound can be omitted.
+
+    :param str value: The command line argument
+    :returns: The tuple of the first and last layer, the last layer is None
+      if the range is unbounded
+    :raises argparse.ArgumentTypeError: if the value is not a valid range of
+      non-negative integers
+    """
+    first, sep, last = value.partition(':')
+    try:
+        first = int(first) if first else 0
+        if not sep:
+            last = first
+        else:
+            last = int(last) if last else None
+    except ValueError:
+        first = None
+    if (
+        first is None or first < 0 or
+        (last is not None and last < first)
+    ):
+        raise argparse.ArgumentTypeError(
+            'must be a non-negative integer or a range FROM:TO of them')
+    return first, last
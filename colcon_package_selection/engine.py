@@ -0,0 +1,362 @@
+# Copyright 2026 Dirk Thomas
+# Licensed under the Apache License, Version 2.0
+
+"""
+Select packages based on a dependency graph without any argument parsing.
+
+The functions in this module operate on an immutable
+:py:class:`PackageGraph` and return a frozenset of package names.
+Indexes which are only needed by some queries are computed on first use and
+reused by all following queries against the same graph.
+"""
+
+import re
+
+
+class PackageGraph:
+    """An immutable graph of packages in topological order."""
+
+    __slots__ = (
+        '_names',
+        '_paths',
+        '_indices',
+        '_dependencies',
+        '_recursive_dependencies',
+        '_depths',
+        '_recursive_dependents',
+        '_layers',
+    )
+
+    def __init__(
+        self, names, paths, dependencies, recursive_dependencies, depths=None,
+    ):
+        """
+        Construct a graph.
+
+        All dependencies are referenced by the index of the package in
+        `names` and must be ordered before the package itself.
+
+        :param Iterable[str] names: The package names in topological order
+        :param Iterable[str] paths: The package paths
+        :param Iterable[Iterable[int]] dependencies: The indices of the direct
+          dependencies of each package
+        :param Iterable[Iterable[int]] recursive_dependencies: The indices of
+          the recursive dependencies of each package
+        :param depths: The depth of each recursive dependency in the same
+          structure as `recursive_dependencies`, or a callable returning
+          them which is only invoked when the depths are needed, if None all
+          recursive dependencies which aren't direct dependencies have an
+          unknown depth
+        """
+        self._names = tuple(names)
+        self._paths = tuple(str(p) for p in paths)
+        self._indices = {name: i for i, name in enumerate(self._names)}
+        self._dependencies = tuple(tuple(d) for d in dependencies)
+        self._recursive_dependencies = tuple(
+            tuple(d) for d in recursive_dependencies)
+        self._depths = depths
+        if depths is not None and not callable(depths):
+            self._depths = tuple(tuple(d) for d in depths)
+        self._recursive_dependents = None
+        self._layers = None
+        assert len(self._names) == len(self._indices), \
+            'Duplicate package names not supported'
+        assert len(self._names) == len(self._paths) == \
+            len(self._dependencies) == len(self._recursive_dependencies)
+
+    @classmethod
+    def from_decorators(cls, decorators):
+        """
+        Create a graph from package decorators.
+
+        :param list decorators: The package decorators in topological order
+        :rtype: :py:class:`PackageGraph`
+        """
+        indices = {d.descriptor.name: i for i, d in enumerate(decorators)}
+        dependencies = []
+        recursive_dependencies = []
+        for decorator in decorators:
+            recursive = list(
+                map(indices.get, decorator.recursive_dependencies or ()))
+            if None in recursive:
+                recursive = [i for i in recursive if i is not None]
+            recursive_dependencies.append(recursive)
+            recursive_set = set(recursive)
+            dependencies.append(sorted({
+                indices[d] for d in decorator.descriptor.get_dependencies()
+                if indices.get(d) in recursive_set}))
+
+        def get_depths():
+            return [
+                [
+                    d.metadata.get('depth')
+                    for d in decorator.recursive_dependencies or ()
+                    if d in indices]
+                for decorator in decorators]
+
+        return cls(
+            [d.descriptor.name for d in decorators],
+            [d.descriptor.path for d in decorators],
+            dependencies, recursive_dependencies, get_depths)
+
+    @property
+    def names(self):
+        """Get the package names in topological order."""
+        return self._names
+
+    @property
+    def paths(self):
+        """Get the package paths in the same order as the names."""
+        return self._paths
+
+    @property
+    def dependency_indices(self):
+        """
+        Get the indices of the direct dependencies of each package.
+
+        The dependencies are referenced by the index of the package in
+        :py:attr:`names`.
+        """
+        return self._dependencies
+
+    @property
+    def recursive_dependency_indices(self):
+        """
+        Get the indices of the recursive dependencies of each package.
+
+        The dependencies are referenced by the index of the package in
+        :py:attr:`names`.
+        """
+        return self._recursive_dependencies
+
+    @property
+    def depths(self):
+        """
+        Get the depth of each recursive dependency of each package.
+
+        The depths are in the same structure as
+        :py:attr:`recursive_dependency_indices`, an unknown depth is None.
+        """
+        return self._get_depths()
+
+    def __len__(self):  # noqa: D105
+        return len(self._names)
+
+    def __contains__(self, name):  # noqa: D105
+        return name in self._indices
+
+    def __iter__(self):  # noqa: D105
+        return iter(self._names)
+
+    def get_path(self, name):
+        """
+        Get the path of a package.
+
+        :param str name: The package name
+        :rtype: str
+        """
+        return self._paths[self._indices[name]]
+
+    def get_index(self, name):
+        """
+        Get the index of a package.
+
+        :param str name: The package name
+        :rtype: int
+        """
+        return self._indices[name]
+
+    def get_dependencies(self, name):
+        """
+        Get the direct dependencies of a package.
+
+        :param str name: The package name
+        :rtype: frozenset
+        """
+        return frozenset(
+            self._names[i] for i in self._dependencies[self._indices[name]])
+
+    def get_recursive_dependencies(self, name):
+        """
+        Get the recursive dependencies of a package.
+
+        :param str name: The package name
+        :rtype: frozenset
+        """
+        return frozenset(
+            self._names[i]
+            for i in self._recursive_dependencies[self._indices[name]])
+
+    def _get_depths(self):
+        # the depths are only resolved when needed
+        if callable(self._depths):
+            self._depths = tuple(tuple(d) for d in self._depths())
+        elif self._depths is None:
+            self._depths = tuple(
+                tuple(1 if d in direct else None for d in recursive)
+                for direct, recursive in zip(
+                    self._dependencies, self._recursive_dependencies))
+        return self._depths
+
+    def _get_recursive_dependents(self):
+        # reverse index of the recursive dependencies, computed on demand
+        if self._recursive_dependents is None:
+            dependents = [[] for _ in self._names]
+            for i, recursive in enumerate(self._recursive_dependencies):
+                for j in recursive:
+                    dependents[j].append(i)
+            self._recursive_dependents = tuple(
+                tuple(d) for d in dependents)
+        return self._recursive_dependents
+
+    def _get_layers(self):
+        # the longest path from any root, computed on demand in a single pass
+        # since all dependencies are ordered before the package itself
+        if self._layers is None:
+            layers = []
+            for dependencies in self._dependencies:
+                layers.append(1 + max(
+                    map(layers.__getitem__, dependencies), default=-1))
+            self._layers = tuple(layers)
+        return self._layers
+
+    def _to_indices(self, names):
+        return {self._indices[n] for n in names if n in self._indices}
+
+    def _to_names(self, indices):
+        return frozenset(self._names[i] for i in indices)
+
+
+def match(names, patterns):
+    """
+    Get the packages where any of the patterns match the package name.
+
+    Only the package names are needed, therefore no graph has to be created.
+
+    :param Iterable[str] names: The package names, e.g. a
+      :py:class:`PackageGraph`
+    :param Iterable patterns: The regular expressions, either as strings or
+      compiled patterns
+    :rtype: frozenset
+    """
+    patterns = [re.compile(p) for p in patterns]
+    return frozenset(
+        name for name in names
+        if any(p.match(name) for p in patterns))
+
+
+def up_to(graph, names):
+    """
+    Get the packages and their recursive dependencies.
+
+    :param graph: The :py:class:`PackageGraph`
+    :param Iterable[str] names: The package names, unknown names are ignored
+    :rtype: frozenset
+    """
+    indices = graph._to_indices(names)
+    for i in list(indices):
+        indices.update(graph._recursive_dependencies[i])
+    return graph._to_names(indices)
+
+
+def above(graph, names, depth=None):
+    """
+    Get the packages and the packages recursively depending on them.
+
+    :param graph: The :py:class:`PackageGraph`
+    :param Iterable[str] names: The package names, unknown names are ignored
+    :param int depth: The maximum depth of the dependency, if None the depth
+      is unlimited
+    :rtype: frozenset
+    """
+    indices = graph._to_indices(names)
+    if depth is None:
+        dependents = graph._get_recursive_dependents()
+        for i in list(indices):
+            indices.update(dependents[i])
+        return graph._to_names(indices)
+
+    result = set(indices)
+    depths = graph._get_depths()
+    for i, recursive in enumerate(graph._recursive_dependencies):
+        if i in result:
+            continue
+        for j, dep_depth in zip(recursive, depths[i]):
+            if j in indices and dep_depth is not None and dep_depth <= depth:
+                result.add(i)
+                break
+    return graph._to_names(result)
+
+
+def above_and_dependencies(graph, names):
+    """
+    Get the packages above some packages including all their dependencies.
+
+    :param graph: The :py:class:`PackageGraph`
+    :param Iterable[str] names: The package names, unknown names are ignored
+    :rtype: frozenset
+    """
+    return up_to(graph, above(graph, names))
+
+
+def depending_on(graph, names):
+    """
+    Get the packages which recursively depend on any of the packages.
+
+    The passed packages themselves are only part of the result if they
+    depend on any of the other passed packages.
+
+    :param graph: The :py:class:`PackageGraph`
+    :param Iterable[str] names: The package names, unknown names are ignored
+    :rtype: frozenset
+    """
+    dependents = graph._get_recursive_dependents()
+    result = set()
+    for i in graph._to_indices(names):
+        result.update(dependents[i])
+    return graph._to_names(result)
+
+
+def get_layers(graph):
+    """
+    Get the topological layer of each package.
+
+    Packages without any dependencies are in layer 0.
+    Every other package is in the layer after the highest layer of any of its
+    dependencies, which is the length of the longest path from any package
+    without dependencies.
+    Therefore all packages within one layer can be processed in parallel
+    once all packages of the previous layers have been processed.
+
+    :param graph: The :py:class:`PackageGraph`
+    :returns: The layer for each package name
+    :rtype: dict
+    """
+    return dict(zip(graph.names, graph._get_layers()))
+
+
+def in_layers(graph, first, last=None):
+    """
+    Get the packages within a range of topological layers.
+
+    :param graph: The :py:class:`PackageGraph`
+    :param int first: The first layer
+    :param int last: The last layer (inclusive), if None the range is
+      unbounded
+    :rtype: frozenset
+    """
+    return frozenset(
+        name for name, layer in zip(graph.names, graph._get_layers())
+        if layer >= first and (last is None or layer <= last))
+
+
+def ordered(graph, names):
+    """
+    Iterate over packages in topological order.
+
+    :param graph: The :py:class:`PackageGraph`
+    :param Iterable[str] names: The package names, unknown names are ignored
+    :returns: A generator of package names
+    """
+    indices = graph._to_indices(names)
+    return (graph.names[i] for i in sorted(indices))
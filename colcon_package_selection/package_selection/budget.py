@@ -0,0 +1,152 @@
+# Copyright 2026 Dirk Thomas
+# Licensed under the Apache License, Version 2.0
+
+from colcon_core.package_selection import logger
+from colcon_core.package_selection import PackageSelectionExtensionPoint
+from colcon_core.plugin_system import satisfies_version
+from colcon_package_selection.argument import argument_positive_float
+from colcon_package_selection.argument import argument_positive_int
+from colcon_package_selection.package_selection.previous \
+    import get_estimated_durations
+from colcon_package_selection.package_selection.previous \
+    import get_previous_histories
+from colcon_package_selection.package_selection.previous \
+    import OUTCOME_ABORTED
+from colcon_package_selection.package_selection.previous \
+    import OUTCOME_SUCCESS
+
+# the assumed duration of a package if no package has a known duration
+DEFAULT_DURATION = 60.0
+
+
+class BudgetPackageSelection(PackageSelectionExtensionPoint):
+    """
+    Select packages which fit into a time budget.
+
+    The duration of each package is estimated from the history of previous
+    invocations of the same verb.
+    Packages are added greedily together with their selected recursive
+    dependencies as long as the estimated time fits into the budget.
+    Packages passed to `--packages-up-to` are considered first, followed by
+    packages which failed in their last invocation and then all other
+    packages from the shortest to the longest.
+    """
+
+    # the budget must be applied after all other extensions have selected
+    # the packages
+    PRIORITY = 10
+
+    def __init__(self):  # noqa: D107
+        super().__init__()
+        satisfies_version(
+            PackageSelectionExtensionPoint.EXTENSION_POINT_VERSION, '^1.0')
+
+    def add_arguments(self, *, parser):  # noqa: D102
+        parser.add_argument(
+            '--packages-select-budget', metavar='SECONDS',
+            type=argument_positive_float,
+            help='Only process a subset of packages which is estimated to '
+                 'finish within the given time based on the durations of '
+                 'previous invocations')
+        parser.add_argument(
+            '--packages-budget-workers', metavar='N',
+            type=argument_positive_int, default=1,
+            help='The number of packages processed in parallel to consider '
+                 'for --packages-select-budget (default: 1)')
+
+    def select_packages(self, args, decorators):  # noqa: D102
+        if args.packages_select_budget is None:
+            return
+
+        if not hasattr(args, 'build_base'):
+            logger.warning(
+                "Ignoring '--packages-select-budget' since the invoked verb "
+                "doesn't have a '--build-base' argument and therefore can't "
+                'access information about the previous durations of a '
+                'package')
+            return
+
+        selected = [d for d in decorators if d.selected]
+        verb_name = getattr(args, 'verb_name', None) or 'build'
+        histories = get_previous_histories(
+            args.build_base, [d.descriptor.name for d in selected], verb_name)
+        durations, failed = _get_durations_and_failures(histories)
+
+        chosen = _choose_packages(
+            decorators, durations, failed,
+            getattr(args, 'packages_up_to', None) or (),
+            args.packages_select_budget, args.packages_budget_workers)
+
+        for decorator in selected:
+            pkg = decorator.descriptor
+            if pkg.name not in chosen:
+                logger.info(
+                    "Skipping package '{pkg.name}' in '{pkg.path}' exceeding "
+                    'the time budget'.format_map(locals()))
+                decorator.selected = False
+
+
+def _get_durations_and_failures(histories):
+    durations = get_estimated_durations(
+        histories, default_duration=DEFAULT_DURATION)
+    failed = set()
+    for pkg_name, history in histories.items():
+        entries = [e for e in history if e.outcome != OUTCOME_ABORTED]
+        if entries and entries[-1].outcome != OUTCOME_SUCCESS:
+            failed.add(pkg_name)
+    return durations, failed
+
+
+def _choose_packages(
+    decorators, durations, failed, priority_names, budget, workers,
+):
+    # the recursive dependencies of the decorators are used directly since
+    # creating the package graph would index the recursive dependencies of
+    # all packages, even the ones which don't fit into the budget anyway
+    selected = {d.descriptor.name for d in decorators if d.selected}
+    order = {}
+    costs = {}
+    # the longest path ending in each package, which doesn't change when only
+    # dependency-closed subsets are being chosen
+    longest_paths = {}
+    for decorator in decorators:
+        pkg = decorator.descriptor
+        order[pkg.name] = len(order)
+        costs[pkg.name] = durations[pkg.name] if pkg.name in selected else 0.0
+        # only the dependencies considered by the invoked verb
+        recursive_dependencies = decorator.recursive_dependencies or ()
+        longest_paths[pkg.name] = costs[pkg.name] + max((
+            longest_paths[d] for d in pkg.get_dependencies()
+            if d in longest_paths and d in recursive_dependencies),
+            default=0)
+
+    priority_names = set(priority_names)
+    failed = set(failed)
+    candidates = sorted(
+        selected, key=lambda name: (
+            name not in priority_names, name not in failed, costs[name],
+            order[name]))
+
+    # packages which aren't selected are considered to be done already
+    done = set(order.keys()) - selected
+    available = budget * workers
+    recursive_dependencies = {
+        d.descriptor.name: d.recursive_dependencies or () for d in decorators}
+    for name in candidates:
+        if name in done or longest_paths[name] > budget:
+            continue
+        if costs[name] > available:
+            if name in priority_names or name in failed:
+                continue
+            # the remaining candidates are ordered by their cost
+            break
+        required = set(recursive_dependencies[name])
+        required.add(name)
+        required -= done
+        required_cost = sum(map(costs.__getitem__, required))
+        if required_cost > available:
+            continue
+        done |= required
+        available -= required_cost
+
+    return done & selected
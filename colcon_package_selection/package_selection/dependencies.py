@@ -11,6 +11,12 @@ from colcon_core.package_selection import PackageSelectionExtensionPoint
 from colcon_core.plugin_system import satisfies_version
 from colcon_package_selection.argument import argument_package_name
 from colcon_package_selection.argument import argument_valid_regex
+from colcon_package_selection.engine import above
+from colcon_package_selection.engine import above_and_dependencies
+from colcon_package_selection.engine import depending_on
+from colcon_package_selection.engine import match
+from colcon_package_selection.engine import PackageGraph
+from colcon_package_selection.engine import up_to
 
 
 class _DepthAndPackageNames(argparse.Action):
@@ -119,113 +125,73 @@ class DependenciesPackageSelection(PackageSelectionExtensionPoint):
             sys.exit('\n'.join(error_messages))
 
     def select_packages(self, args, decorators):  # noqa: D102
+        if not any((
+            args.packages_up_to,
+            args.packages_up_to_regex,
+            args.packages_above,
+            args.packages_above_and_dependencies,
+            args.packages_above_depth and len(args.packages_above_depth) > 1,
+            args.packages_select_by_dep,
+            args.packages_skip_by_dep,
+            args.packages_skip_up_to,
+        )):
+            return
+
+        graph = PackageGraph.from_decorators(decorators)
+
         if args.packages_up_to:
-            select_pkgs = set(args.packages_up_to)
-            for decorator in reversed(decorators):
-                if decorator.descriptor.name in select_pkgs:
-                    select_pkgs |= set(decorator.recursive_dependencies)
-                elif decorator.selected:
-                    pkg = decorator.descriptor
-                    logger.info(
-                        "Skipping package '{pkg.name}' in '{pkg.path}'"
-                        .format_map(locals()))
-                    decorator.selected = False
+            _select(decorators, up_to(graph, args.packages_up_to))
 
         if args.packages_up_to_regex:
-            select_pkgs = set()
-            patterns = args.packages_up_to_regex
-            for decorator in reversed(decorators):
-                pkg = decorator.descriptor
-                if (
-                    pkg.name in select_pkgs or
-                    any(re.match(pattern, pkg.name) for pattern in patterns)
-                ):
-                    select_pkgs |= set(decorator.recursive_dependencies)
-                elif decorator.selected:
-                    logger.info(
-                        "Skipping package '{pkg.name}' in '{pkg.path}'"
-                        .format_map(locals()))
-                    decorator.selected = False
+            _select(
+                decorators,
+                up_to(graph, match(
+                    [d.descriptor.name for d in decorators],
+                    args.packages_up_to_regex)))
 
         if args.packages_above:
-            select_pkgs = set(args.packages_above)
-            for decorator in decorators:
-                if decorator.descriptor.name in select_pkgs:
-                    continue
-                if not (select_pkgs & set(decorator.recursive_dependencies)):
-                    if decorator.selected:
-                        pkg = decorator.descriptor
-                        logger.info(
-                            "Skipping package '{pkg.name}' in '{pkg.path}'"
-                            .format_map(locals()))
-                        decorator.selected = False
+            _select(decorators, above(graph, args.packages_above))
 
         if args.packages_above_and_dependencies:
-            # collect all above packages
-            select_pkgs = set(args.packages_above_and_dependencies)
-            for decorator in decorators:
-                if decorator.descriptor.name in select_pkgs:
-                    continue
-                if set(decorator.recursive_dependencies) & select_pkgs:
-                    select_pkgs.add(decorator.descriptor.name)
-
-            for decorator in reversed(decorators):
-                if decorator.descriptor.name in select_pkgs:
-                    select_pkgs |= set(decorator.recursive_dependencies)
-                elif decorator.selected:
-                    pkg = decorator.descriptor
-                    logger.info(
-                        "Skipping package '{pkg.name}' in '{pkg.path}'"
-                        .format_map(locals()))
-                    decorator.selected = False
+            _select(
+                decorators,
+                above_and_dependencies(
+                    graph, args.packages_above_and_dependencies))
 
         if args.packages_above_depth and len(args.packages_above_depth) > 1:
             depth = args.packages_above_depth[0]
-            select_pkgs = set(args.packages_above_depth[1:])
-            for decorator in decorators:
-                if decorator.descriptor.name in select_pkgs:
-                    continue
-                if not [
-                    d for d in set(decorator.recursive_dependencies)
-                    if d in select_pkgs and d.metadata['depth'] <= depth
-                ]:
-                    if decorator.selected:
-                        pkg = decorator.descriptor
-                        logger.info(
-                            "Skipping package '{pkg.name}' in '{pkg.path}'"
-                            .format_map(locals()))
-                        decorator.selected = False
+            _select(
+                decorators,
+                above(graph, args.packages_above_depth[1:], depth=depth))
 
         if args.packages_select_by_dep:
-            deps = set(args.packages_select_by_dep)
-            for decorator in decorators:
-                if not (deps & set(decorator.recursive_dependencies)):
-                    if decorator.selected:
-                        pkg = decorator.descriptor
-                        logger.info(
-                            "Skipping package '{pkg.name}' in '{pkg.path}'"
-                            .format_map(locals()))
-                        decorator.selected = False
+            _select(
+                decorators, depending_on(graph, args.packages_select_by_dep))
 
         if args.packages_skip_by_dep:
-            deps = set(args.packages_skip_by_dep)
-            for decorator in decorators:
-                if deps & set(decorator.recursive_dependencies):
-                    if decorator.selected:
-                        pkg = decorator.descriptor
-                        logger.info(
-                            "Skipping package '{pkg.name}' in '{pkg.path}'"
-                            .format_map(locals()))
-                        decorator.selected = False
+            _skip(decorators, depending_on(graph, args.packages_skip_by_dep))
 
         if args.packages_skip_up_to:
-            skip_pkgs = set(args.packages_skip_up_to)
-            for decorator in reversed(decorators):
-                if decorator.descriptor.name in skip_pkgs:
-                    skip_pkgs |= set(decorator.recursive_dependencies)
-                    if decorator.selected:
-                        pkg = decorator.descriptor
-                        logger.info(
-                            "Skipping package '{pkg.name}' in '{pkg.path}'"
-                            .format_map(locals()))
-                        decorator.selected = False
+            _skip(decorators, up_to(graph, args.packages_skip_up_to))
+
+
+def _select(decorators, pkg_names):
+    # skip all packages which are not part of the passed set
+    for decorator in decorators:
+        if decorator.selected and decorator.descriptor.name not in pkg_names:
+            pkg = decorator.descriptor
+            logger.info(
+                "Skipping package '{pkg.name}' in '{pkg.path}'"
+                .format_map(locals()))
+            decorator.selected = False
+
+
+def _skip(decorators, pkg_names):
+    # skip all packages which are part of the passed set
+    for decorator in decorators:
+        if decorator.selected and decorator.descriptor.name in pkg_names:
+            pkg = decorator.descriptor
+            logger.info(
+                "Skipping package '{pkg.name}' in '{pkg.path}'"
+                .format_map(locals()))
+            decorator.selected = False
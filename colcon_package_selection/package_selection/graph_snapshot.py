@@ -0,0 +1,63 @@
+# Copyright 2026 Dirk Thomas
+# Licensed under the Apache License, Version 2.0
+
+import os
+
+from colcon_core.package_selection import logger
+from colcon_core.package_selection import PackageSelectionExtensionPoint
+from colcon_core.plugin_system import satisfies_version
+from colcon_package_selection.engine import PackageGraph
+from colcon_package_selection.snapshot import is_snapshot_current
+from colcon_package_selection.snapshot import SNAPSHOT_FILENAME
+from colcon_package_selection.snapshot import write_snapshot
+
+
+class GraphSnapshotPackageSelection(PackageSelectionExtensionPoint):
+    """
+    Write a snapshot of the package graph to the build base.
+
+    The snapshot allows tools to query the graph without running the
+    package discovery, see :py:mod:`colcon_package_selection.snapshot`.
+    Each verb considers different dependency categories and therefore writes
+    its own snapshot.
+    It is only rewritten if it doesn't match the current graph.
+    """
+
+    # the snapshot must be written after all other extensions have selected
+    # the packages but before the fail-fast order changes the topological
+    # order of the decorators
+    PRIORITY = 2
+
+    def __init__(self):  # noqa: D107
+        super().__init__()
+        satisfies_version(
+            PackageSelectionExtensionPoint.EXTENSION_POINT_VERSION, '^1.0')
+
+    def add_arguments(self, *, parser):  # noqa: D102
+        parser.add_argument(
+            '--packages-write-graph-snapshot', action='store_true',
+            help='Write a snapshot of the package graph of the invoked verb '
+                 'to the build base for tools querying the graph without '
+                 'running the package discovery')
+
+    def select_packages(self, args, decorators):  # noqa: D102
+        if not args.packages_write_graph_snapshot:
+            return
+        if not hasattr(args, 'build_base'):
+            return
+        verb_name = getattr(args, 'verb_name', None)
+        if verb_name is None:
+            return
+
+        graph = PackageGraph.from_decorators(decorators)
+        path = os.path.join(
+            args.build_base, SNAPSHOT_FILENAME.format_map(locals()))
+        if is_snapshot_current(path, graph):
+            return
+
+        try:
+            write_snapshot(path, graph)
+        except OSError as e:  # noqa: F841
+            logger.warning(
+                "Failed to write the package graph snapshot '{path}': {e}"
+                .format_map(locals()))
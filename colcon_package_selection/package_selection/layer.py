@@ -0,0 +1,72 @@
+# Copyright 2026 Dirk Thomas
+# Licensed under the Apache License, Version 2.0
+
+import pathlib
+import sys
+
+from colcon_core.package_selection import logger
+from colcon_core.package_selection import PackageSelectionExtensionPoint
+from colcon_core.plugin_system import satisfies_version
+from colcon_package_selection.argument import argument_layer_range
+from colcon_package_selection.engine import get_layers
+from colcon_package_selection.engine import in_layers
+from colcon_package_selection.engine import PackageGraph
+
+
+class LayerPackageSelection(PackageSelectionExtensionPoint):
+    """
+    Select packages based on their topological layer.
+
+    Packages without any dependencies are in layer 0, every other package is
+    in the layer after the highest layer of any of its dependencies.
+    All packages within one layer can be processed in parallel once all
+    packages of the previous layers have been processed.
+    """
+
+    def __init__(self):  # noqa: D107
+        super().__init__()
+        satisfies_version(
+            PackageSelectionExtensionPoint.EXTENSION_POINT_VERSION, '^1.0')
+
+    def add_arguments(self, *, parser):  # noqa: D102
+        parser.add_argument(
+            '--packages-layer', metavar='FROM[:TO]', type=argument_layer_range,
+            help='Only process packages within a range of topological layers '
+                 '(packages without dependencies are in layer 0, an omitted '
+                 'bound of a range is unbounded)')
+        parser.add_argument(
+            '--packages-layer-dump', metavar='FILE',
+            help='Write the topological layer and name of all packages to a '
+                 "file ('-' for stdout), one package per line")
+
+    def select_packages(self, args, decorators):  # noqa: D102
+        if args.packages_layer is None and not args.packages_layer_dump:
+            return
+
+        graph = PackageGraph.from_decorators(decorators)
+
+        if args.packages_layer_dump:
+            _dump_layers(graph, args.packages_layer_dump)
+
+        if args.packages_layer is not None:
+            pkg_names = in_layers(graph, *args.packages_layer)
+            for decorator in decorators:
+                pkg = decorator.descriptor
+                if decorator.selected and pkg.name not in pkg_names:
+                    logger.info(
+                        "Skipping package '{pkg.name}' in '{pkg.path}' "
+                        'outside of the selected layers'
+                        .format_map(locals()))
+                    decorator.selected = False
+
+
+def _dump_layers(graph, path):
+    layers = get_layers(graph)
+    lines = []
+    for name in sorted(graph.names, key=layers.__getitem__):
+        layer = layers[name]
+        lines.append('{layer} {name}\n'.format_map(locals()))
+    if path == '-':
+        sys.stdout.writelines(lines)
+    else:
+        pathlib.Path(path).write_text(''.join(lines))
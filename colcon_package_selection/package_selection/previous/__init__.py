@@ -1,12 +1,32 @@
 # Copyright 2019 Dirk Thomas
 # Licensed under the Apache License, Version 2.0
 
+from collections import namedtuple
+import os
 import pathlib
+import struct
 
 RESULT_FILENAME = 'colcon_{verb_name}.rc'
+TIMESTAMP_FILENAME = 'colcon_{verb_name}.stamp'
+HISTORY_FILENAME = 'colcon_{verb_name}.history'
+RESULT_MATRIX_FILENAME = 'colcon_results.matrix'
 
 TEST_FAILURE_RESULT = 'test failures'
 
+# the maximum number of entries kept in the history of each package
+HISTORY_SIZE = 20
+
+OUTCOME_SUCCESS = 0
+OUTCOME_FAILURE = 1
+OUTCOME_TEST_FAILURE = 2
+OUTCOME_ABORTED = 3
+
+HistoryEntry = namedtuple(
+    'HistoryEntry', ('timestamp', 'duration', 'outcome'))
+
+# little endian fixed size records: timestamp, duration, outcome
+_HISTORY_RECORD = struct.Struct('<dfB')
+
 
 def get_previous_result(package_build_base, verb_name):
     """
@@ -23,18 +43,267 @@ def get_previous_result(package_build_base, verb_name):
     return path.read_text().rstrip()
 
 
-def set_result(package_build_base, verb_name, result):
+def get_previous_results(build_base, pkg_names, verb_name):
+    """
+    Get the results of a verb for multiple packages at once.
+
+    The build base is listed only once to avoid checking for the result file
+    of packages which don't have a build directory.
+
+    :param str build_base: The build base containing the package build
+      directories
+    :param Iterable[str] pkg_names: The package names
+    :param str verb_name: The invoked verb name
+    :returns: The previously persisted result for each package name, None if
+      no result was persisted
+    :rtype: dict
+    """
+    return _read_package_files(
+        build_base, pkg_names, RESULT_FILENAME.format_map(locals()))
+
+
+def get_previous_timestamps(build_base, pkg_names, verb_name):
+    """
+    Get the time when a verb has finished for multiple packages at once.
+
+    :param str build_base: The build base containing the package build
+      directories
+    :param Iterable[str] pkg_names: The package names
+    :param str verb_name: The invoked verb name
+    :returns: The previously persisted timestamp for each package name, None
+      if no timestamp was persisted
+    :rtype: dict
+    """
+    timestamps = _read_package_files(
+        build_base, pkg_names, TIMESTAMP_FILENAME.format_map(locals()))
+    for pkg_name, timestamp in timestamps.items():
+        if timestamp is not None:
+            try:
+                timestamps[pkg_name] = float(timestamp)
+            except ValueError:
+                timestamps[pkg_name] = None
+    return timestamps
+
+
+def get_previous_histories(build_base, pkg_names, verb_name):
+    """
+    Get the history of a verb for multiple packages at once.
+
+    :param str build_base: The build base containing the package build
+      directories
+    :param Iterable[str] pkg_names: The package names
+    :param str verb_name: The invoked verb name
+    :returns: The list of :py:class:`HistoryEntry` for each package name
+      ordered from oldest to newest, an empty list if no history was persisted
+    :rtype: dict
+    """
+    histories = _read_package_files(
+        build_base, pkg_names, HISTORY_FILENAME.format_map(locals()),
+        binary=True)
+    for pkg_name, data in histories.items():
+        histories[pkg_name] = _parse_history(data or b'')
+    return histories
+
+
+def get_estimated_durations(histories, *, default_duration):
+    """
+    Estimate the duration of packages based on their history.
+
+    Aborted entries are ignored and the known durations of the other entries
+    are averaged.
+
+    :param dict histories: The list of :py:class:`HistoryEntry` for each
+      package name, e.g. as returned by :py:func:`get_previous_histories`
+    :param float default_duration: The duration if none of the packages has
+      a known duration
+    :returns: The estimated duration for each package name
+    :rtype: dict
+    """
+    durations = {}
+    for pkg_name, history in histories.items():
+        known_durations = [
+            e.duration for e in history
+            if e.outcome != OUTCOME_ABORTED and e.duration > 0]
+        if known_durations:
+            durations[pkg_name] = sum(known_durations) / len(known_durations)
+
+    # packages without a known duration are assumed to take the median time
+    if durations:
+        default_duration = sorted(durations.values())[len(durations) // 2]
+    for pkg_name in histories.keys():
+        durations.setdefault(pkg_name, default_duration)
+    return durations
+
+
+def add_history_entry(
+    package_build_base, verb_name, entry, *, size=HISTORY_SIZE,
+):
+    """
+    Append an entry to the history of a verb in the package build directory.
+
+    Only the newest `size` entries are being kept.
+
+    :param str package_build_base: The build directory of a package
+    :param str verb_name: The invoked verb name
+    :param HistoryEntry entry: The entry to append
+    :param int size: The maximum number of entries to keep
+    """
+    path = pathlib.Path(package_build_base) / \
+        HISTORY_FILENAME.format_map(locals())
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        data = path.read_bytes()
+    except FileNotFoundError:
+        data = b''
+    # ignore a trailing partial record
+    data = data[:len(data) - len(data) % _HISTORY_RECORD.size]
+    data += _HISTORY_RECORD.pack(*entry)
+    path.write_bytes(data[-size * _HISTORY_RECORD.size:])
+
+
+def set_result(package_build_base, verb_name, result, *, timestamp=None):
     """
     Persist the result of a verb in the package build directory.
 
     :param str package_build_base: The build directory of a package
     :param str verb_name: The invoked verb name
     :param str result: The result of the invocation
+    :param float timestamp: The time when the invocation finished, if None no
+      timestamp is persisted
     """
     path = _get_result_path(package_build_base, verb_name)
     path.parent.mkdir(parents=True, exist_ok=True)
     path.write_text(str(result) + '\n')
 
+    if timestamp is not None:
+        path = path.parent / TIMESTAMP_FILENAME.format_map(locals())
+        path.write_text(repr(float(timestamp)) + '\n')
+
+
+def get_result_matrix(build_base):
+    """
+    Get the results of all verbs for all packages at once.
+
+    :param str build_base: The build base containing the result matrix
+    :returns: A dictionary mapping each verb name to a dictionary mapping
+      package names to the most recently persisted result
+    :rtype: dict
+    """
+    matrix = {}
+    entries, _ = _read_result_matrix(build_base)
+    for verb_name, pkg_name, result in entries:
+        matrix.setdefault(verb_name, {})[pkg_name] = result
+    return matrix
+
+
+def add_matrix_result(build_base, verb_name, pkg_name, result):
+    """
+    Persist the result of a verb for a package in the result matrix.
+
+    The result is appended to the file in the build base which is therefore
+    cheap independent of the number of packages.
+    Superseded results are only removed by :py:func:`compact_result_matrix`.
+
+    :param str build_base: The build base containing the result matrix
+    :param str verb_name: The invoked verb name
+    :param str pkg_name: The package name
+    :param str result: The result of the invocation
+    """
+    path = pathlib.Path(build_base) / RESULT_MATRIX_FILENAME
+    path.parent.mkdir(parents=True, exist_ok=True)
+    line = '{verb_name}\t{pkg_name}\t{result}\n'.format_map(locals())
+    with path.open('a+b') as h:
+        # terminate a partially written line to not corrupt the new result
+        if h.seek(0, os.SEEK_END):
+            h.seek(-1, os.SEEK_END)
+            if h.read(1) != b'\n':
+                line = '\n' + line
+        h.write(line.encode())
+
+
+def compact_result_matrix(build_base):
+    """
+    Remove superseded results from the result matrix.
+
+    Partially written lines, e.g. of an interrupted invocation, are removed
+    as well.
+    The compacted matrix is written to a temporary file first and then
+    renamed to replace the previous file atomically.
+
+    :param str build_base: The build base containing the result matrix
+    """
+    import tempfile
+
+    entries, valid = _read_result_matrix(build_base)
+    matrix = {}
+    for verb_name, pkg_name, result in entries:
+        matrix[(verb_name, pkg_name)] = result
+    if valid and len(matrix) == len(entries):
+        return
+
+    path = pathlib.Path(build_base) / RESULT_MATRIX_FILENAME
+    fd, tmp_path = tempfile.mkstemp(
+        dir=str(path.parent), prefix='.' + path.name + '.', suffix='.tmp')
+    replaced = False
+    try:
+        with os.fdopen(fd, 'w') as h:
+            for (verb_name, pkg_name), result in matrix.items():
+                h.write(
+                    '{verb_name}\t{pkg_name}\t{result}\n'
+                    .format_map(locals()))
+        os.replace(tmp_path, str(path))
+        replaced = True
+    finally:
+        if not replaced:
+            os.remove(tmp_path)
+
+
+def _read_result_matrix(build_base):
+    path = pathlib.Path(build_base) / RESULT_MATRIX_FILENAME
+    try:
+        content = path.read_text()
+    except FileNotFoundError:
+        return [], True
+    valid = not content or content.endswith('\n')
+    entries = []
+    for line in content.splitlines():
+        fields = line.split('\t')
+        # ignore a partially written line
+        if len(fields) == 3 and all(fields):
+            entries.append(tuple(fields))
+        else:
+            valid = False
+    return entries, valid
+
+
+def _parse_history(data):
+    data = data[:len(data) - len(data) % _HISTORY_RECORD.size]
+    return [
+        HistoryEntry(*values)
+        for values in _HISTORY_RECORD.iter_unpack(data)]
+
+
+def _read_package_files(build_base, pkg_names, filename, *, binary=False):
+    try:
+        existing = {
+            entry.name for entry in os.scandir(build_base) if entry.is_dir()}
+    except FileNotFoundError:
+        existing = set()
+    contents = {}
+    for pkg_name in pkg_names:
+        content = None
+        if pkg_name in existing:
+            path = pathlib.Path(build_base) / pkg_name / filename
+            try:
+                if binary:
+                    content = path.read_bytes()
+                else:
+                    content = path.read_text().rstrip()
+            except FileNotFoundError:
+                pass
+        contents[pkg_name] = content
+    return contents
+
 
 def _get_result_path(package_build_base, verb_name):
     return pathlib.Path(
@@ -0,0 +1,48 @@
+# Copyright 2026 Dirk Thomas
+# Licensed under the Apache License, Version 2.0
+
+import os
+
+from colcon_core.package_selection import PackageSelectionExtensionPoint
+from colcon_core.plugin_system import satisfies_version
+from colcon_package_selection.package_selection.previous.result_cache \
+    import get_package_keys
+from colcon_package_selection.package_selection.previous.result_cache \
+    import get_result_cache_path
+from colcon_package_selection.package_selection.previous.result_cache \
+    import set_package_key
+
+
+class CacheKeyPackageSelectionExtension(PackageSelectionExtensionPoint):
+    """
+    Record the cache keys of the packages selected to be built.
+
+    The keys are computed before any package is being built and are used to
+    publish successful builds to the shared result cache.
+    Only the keys of the selected packages and their recursive dependencies
+    are computed.
+    """
+
+    # the keys must be recorded after all other extensions have selected the
+    # packages
+    PRIORITY = 5
+
+    def __init__(self):  # noqa: D107
+        super().__init__()
+        satisfies_version(
+            PackageSelectionExtensionPoint.EXTENSION_POINT_VERSION, '^1.0')
+
+    def select_packages(self, args, decorators):  # noqa: D102
+        if getattr(args, 'verb_name', None) != 'build':
+            return
+        if not hasattr(args, 'build_base'):
+            return
+        if get_result_cache_path() is None:
+            return
+
+        pkg_names = [d.descriptor.name for d in decorators if d.selected]
+        package_keys = get_package_keys(decorators, pkg_names)
+        for pkg_name in pkg_names:
+            set_package_key(
+                os.path.join(args.build_base, pkg_name), 'build',
+                package_keys[pkg_name])
@@ -1,53 +1,183 @@
 # Copyright 2019 Dirk Thomas
 # Licensed under the Apache License, Version 2.0
 
+import os
+import time
+
 from colcon_core.event.job import JobEnded
+from colcon_core.event.job import JobStarted
 from colcon_core.event.test import TestFailure
 from colcon_core.event_handler import EventHandlerExtensionPoint
+from colcon_core.event_reactor import EventReactorShutdown
 from colcon_core.plugin_system import satisfies_version
-from colcon_core.verb.build import BuildPackageArguments
-from colcon_core.verb.test import TestPackageArguments
+from colcon_package_selection.package_selection.previous \
+    import add_history_entry
+from colcon_package_selection.package_selection.previous \
+    import add_matrix_result
+from colcon_package_selection.package_selection.previous \
+    import compact_result_matrix
+from colcon_package_selection.package_selection.previous \
+    import HistoryEntry
+from colcon_package_selection.package_selection.previous \
+    import OUTCOME_ABORTED
+from colcon_package_selection.package_selection.previous \
+    import OUTCOME_FAILURE
+from colcon_package_selection.package_selection.previous \
+    import OUTCOME_SUCCESS
+from colcon_package_selection.package_selection.previous \
+    import OUTCOME_TEST_FAILURE
 from colcon_package_selection.package_selection.previous \
     import set_result
 from colcon_package_selection.package_selection.previous \
     import TEST_FAILURE_RESULT
+from colcon_package_selection.package_selection.previous.result_cache \
+    import evict_results
+from colcon_package_selection.package_selection.previous.result_cache \
+    import get_package_key
+from colcon_package_selection.package_selection.previous.result_cache \
+    import get_result_cache_path
+from colcon_package_selection.package_selection.previous.result_cache \
+    import get_result_cache_size
+from colcon_package_selection.package_selection.previous.result_cache \
+    import publish_result
 
 
 class StoreResultEventHandler(EventHandlerExtensionPoint):
     """
     Persist the result of a job in a file in its build directory.
 
+    The verb is determined by the task of the job, therefore the results of
+    any verb are being persisted.
+    Additionally the result is recorded in the result matrix of the build
+    base which is compacted at the end.
+
+    Along with the result the time when the job ended is persisted.
+    The timestamps are monotonically increasing within one invocation even if
+    the system clock is adjusted backwards.
+    Additionally the outcome and duration of the job are appended to a
+    bounded history.
+
+    If a shared result cache is configured successful builds are published
+    to it and the least recently used entries are evicted at the end.
+
     The extension handles events of the following types:
+    - :py:class:`colcon_core.event.job.JobStarted`
     - :py:class:`colcon_core.event.job.JobEnded`
     - :py:class:`colcon_core.event.test.TestFailure`
+    - :py:class:`colcon_core.event_reactor.EventReactorShutdown`
     """
 
     def __init__(self):  # noqa: D107
         super().__init__()
         satisfies_version(
             EventHandlerExtensionPoint.EXTENSION_POINT_VERSION, '^1.0')
+        # the state of running jobs is tracked by (package name, verb name)
+        # instead of the job itself to not keep the job alive after it ended
         self._test_failures = set()
+        self._start_times = {}
+        self._last_timestamp = None
+        self._published_results = False
+        self._matrix_build_bases = set()
+        self._handlers = {
+            EventReactorShutdown: self._handle_shutdown,
+            JobStarted: self._handle_job_started,
+            TestFailure: self._handle_test_failure,
+            JobEnded: self._handle_job_ended,
+        }
 
     def __call__(self, event):  # noqa: D102
-        data = event[0]
+        # also dispatch subclasses of the handled event types
+        for event_type in type(event[0]).__mro__:
+            handler = self._handlers.get(event_type)
+            if handler is not None:
+                handler(event[0], event[1])
+                return
 
-        if isinstance(data, TestFailure):
-            job = event[1]
-            self._test_failures.add(job)
+    def _handle_shutdown(self, data, job):
+        for build_base in self._matrix_build_bases:
+            compact_result_matrix(build_base)
+        self._matrix_build_bases.clear()
+        if self._published_results:
+            evict_results(get_result_cache_path(), get_result_cache_size())
 
-        elif isinstance(data, JobEnded):
-            job = event[1]
+    def _handle_job_started(self, data, job):
+        key = _get_job_key(job)
+        if key is not None:
+            self._start_times[key] = time.monotonic()
 
-            if isinstance(job.task_context.args, BuildPackageArguments):
-                verb_name = 'build'
-            elif isinstance(job.task_context.args, TestPackageArguments):
-                verb_name = 'test'
-            else:
-                return
+    def _handle_test_failure(self, data, job):
+        key = _get_job_key(job)
+        if key is not None:
+            self._test_failures.add(key)
 
-            if job in self._test_failures:
-                result = TEST_FAILURE_RESULT
+    def _handle_job_ended(self, data, job):
+        # the module imports asyncio which is expensive and therefore only
+        # done when the first job has ended
+        from colcon_core.subprocess import SIGINT_RESULT
+
+        key = _get_job_key(job)
+        if key is None:
+            return
+        start_time = self._start_times.pop(key, None)
+        _, verb_name = key
+
+        if key in self._test_failures:
+            self._test_failures.remove(key)
+            result = TEST_FAILURE_RESULT
+            outcome = OUTCOME_TEST_FAILURE
+        else:
+            result = data.rc
+            if not result:
+                outcome = OUTCOME_SUCCESS
+            elif result == SIGINT_RESULT:
+                outcome = OUTCOME_ABORTED
             else:
-                result = data.rc
+                outcome = OUTCOME_FAILURE
+
+        timestamp = time.time()
+        if (
+            self._last_timestamp is not None and
+            timestamp <= self._last_timestamp
+        ):
+            timestamp = self._last_timestamp + 1e-6
+        self._last_timestamp = timestamp
+
+        build_base = getattr(job.task_context.args, 'build_base', None)
+        if build_base is None:
+            return
+        set_result(build_base, verb_name, result, timestamp=timestamp)
+
+        # the build directory of a package is named after the package
+        pkg_name = job.task_context.pkg.name
+        if os.path.basename(os.path.normpath(build_base)) == pkg_name:
+            matrix_build_base = os.path.dirname(os.path.normpath(build_base))
+            add_matrix_result(matrix_build_base, verb_name, pkg_name, result)
+            self._matrix_build_bases.add(matrix_build_base)
+
+        duration = 0.0
+        if start_time is not None:
+            duration = time.monotonic() - start_time
+        add_history_entry(
+            build_base, verb_name,
+            HistoryEntry(timestamp, duration, outcome))
+
+        if verb_name == 'build' and outcome == OUTCOME_SUCCESS:
+            self._publish_result(job, build_base)
+
+    def _publish_result(self, job, build_base):
+        cache_path = get_result_cache_path()
+        if cache_path is None:
+            return
+        key = get_package_key(build_base, 'build')
+        if key is None:
+            return
+        publish_result(cache_path, key, job.task_context.pkg.name + '\n')
+        self._published_results = True
+
 
-            set_result(job.task_context.args.build_base, verb_name, result)
+def _get_job_key(job):
+    # the task name of a job is the name of the verb it was created by
+    verb_name = getattr(job.task, 'TASK_NAME', None)
+    if verb_name is None:
+        return None
+    return (job.task_context.pkg.name, verb_name)
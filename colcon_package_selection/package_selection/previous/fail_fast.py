@@ -0,0 +1,101 @@
+# Copyright 2026 Dirk Thomas
+# Licensed under the Apache License, Version 2.0
+
+import heapq
+
+from colcon_core.package_selection import logger
+from colcon_core.package_selection import PackageSelectionExtensionPoint
+from colcon_core.plugin_system import satisfies_version
+from colcon_package_selection.engine import PackageGraph
+from colcon_package_selection.package_selection.previous \
+    import get_estimated_durations
+from colcon_package_selection.package_selection.previous \
+    import get_previous_histories
+from colcon_package_selection.package_selection.previous \
+    import OUTCOME_ABORTED
+from colcon_package_selection.package_selection.previous \
+    import OUTCOME_SUCCESS
+
+
+class FailFastOrderPackageSelectionExtension(PackageSelectionExtensionPoint):
+    """
+    Order the packages by their probability of test failures.
+
+    The order of the decorators is changed in place while still respecting
+    the dependencies.
+    """
+
+    # the order must only be changed after all other extensions have
+    # selected the packages since e.g. `--packages-start` relies on the
+    # topological order
+    PRIORITY = 1
+
+    def __init__(self):  # noqa: D107
+        super().__init__()
+        satisfies_version(
+            PackageSelectionExtensionPoint.EXTENSION_POINT_VERSION, '^1.0')
+
+    def add_arguments(self, *, parser):  # noqa: D102
+        parser.add_argument(
+            '--packages-test-fail-fast-order', action='store_true',
+            help='Order the packages (while still respecting their '
+                 'dependencies) by the probability of test failures per '
+                 'second of test time based on their recent test history')
+
+    def select_packages(self, args, decorators):  # noqa: D102
+        if not args.packages_test_fail_fast_order:
+            return
+
+        if not hasattr(args, 'build_base'):
+            logger.warning(
+                "Ignoring '--packages-test-fail-fast-order' since the invoked "
+                "verb doesn't have a '--build-base' argument and therefore "
+                "can't access information about the previous state of a "
+                'package')
+            return
+
+        histories = get_previous_histories(
+            args.build_base, [d.descriptor.name for d in decorators], 'test')
+        _order_fail_fast(decorators, histories)
+
+
+def _order_fail_fast(decorators, histories):
+    # estimate the failure probability (with additive smoothing to account
+    # for packages with a short history)
+    probabilities = {}
+    for pkg_name, history in histories.items():
+        entries = [e for e in history if e.outcome != OUTCOME_ABORTED]
+        failures = sum(1 for e in entries if e.outcome != OUTCOME_SUCCESS)
+        probabilities[pkg_name] = (failures + 1) / (len(entries) + 2)
+    durations = get_estimated_durations(histories, default_duration=1.0)
+
+    # topological sort always picking the package with the highest failure
+    # probability per second among the ones whose dependencies are ordered
+    graph = PackageGraph.from_decorators(decorators)
+    indices = {d.descriptor.name: i for i, d in enumerate(decorators)}
+    dependents = [[] for _ in decorators]
+    pending = [0] * len(decorators)
+    for i, decorator in enumerate(decorators):
+        for dep in graph.get_dependencies(decorator.descriptor.name):
+            dependents[indices[dep]].append(i)
+            pending[i] += 1
+
+    def priority(i):
+        pkg_name = decorators[i].descriptor.name
+        duration = max(durations[pkg_name], 1e-3)
+        return (-probabilities.get(pkg_name, 0.5) / duration, i)
+
+    ready = [priority(i) for i, count in enumerate(pending) if not count]
+    heapq.heapify(ready)
+    ordered = []
+    while ready:
+        _, i = heapq.heappop(ready)
+        ordered.append(decorators[i])
+        for j in dependents[i]:
+            pending[j] -= 1
+            if not pending[j]:
+                heapq.heappush(ready, priority(j))
+
+    # keep the original order in case of unexpected cycles
+    if len(ordered) == len(decorators):
+        decorators[:] = ordered
@@ -1,14 +1,31 @@
 # Copyright 2019 Dirk Thomas
 # Licensed under the Apache License, Version 2.0
 
-import os
-
 from colcon_core.package_selection import logger
 from colcon_core.package_selection import PackageSelectionExtensionPoint
 from colcon_core.plugin_system import satisfies_version
-from colcon_core.subprocess import SIGINT_RESULT
+from colcon_package_selection.engine import depending_on
+from colcon_package_selection.engine import PackageGraph
+from colcon_package_selection.package_selection.previous \
+    import get_previous_histories
+from colcon_package_selection.package_selection.previous \
+    import get_previous_results
+from colcon_package_selection.package_selection.previous \
+    import get_previous_timestamps
+from colcon_package_selection.package_selection.previous \
+    import get_result_matrix
 from colcon_package_selection.package_selection.previous \
-    import get_previous_result
+    import OUTCOME_ABORTED
+from colcon_package_selection.package_selection.previous \
+    import OUTCOME_SUCCESS
+from colcon_package_selection.package_selection.previous.result_cache \
+    import get_package_keys
+from colcon_package_selection.package_selection.previous.result_cache \
+    import get_result_cache_path
+from colcon_package_selection.package_selection.previous.result_cache \
+    import has_cached_result
+from colcon_package_selection.package_selection.previous.result_cache \
+    import RESULT_CACHE_ENVIRONMENT_VARIABLE
 
 
 class PreviousPackageSelectionExtension(PackageSelectionExtensionPoint):
@@ -30,6 +47,17 @@ class PreviousPackageSelectionExtension(PackageSelectionExtensionPoint):
             '--packages-skip-build-finished', action='store_true',
             help='Skip a set of packages which have finished to build '
                  'previously')
+        group.add_argument(
+            '--packages-skip-build-up-to-date', action='store_true',
+            help='Skip a set of packages which have finished to build '
+                 'previously after all their recursive dependencies have '
+                 'finished to build')
+        group.add_argument(
+            '--packages-skip-build-cached', action='store_true',
+            help='Skip a set of packages which have been built successfully '
+                 'with identical sources and dependencies according to the '
+                 'shared result cache (see the environment variable {env})'
+                 .format(env=RESULT_CACHE_ENVIRONMENT_VARIABLE.name))
         group.add_argument(
             '--packages-select-test-failures', action='store_true',
             help='Only process a subset of packages which had test failures '
@@ -38,13 +66,38 @@ class PreviousPackageSelectionExtension(PackageSelectionExtensionPoint):
             '--packages-skip-test-passed', action='store_true',
             help='Skip a set of packages which had no test failures '
                  'previously')
+        group.add_argument(
+            '--packages-resume', action='store_true',
+            help='Only process a subset of packages which have failed to '
+                 'build or were aborted previously as well as packages '
+                 'recursively depending on them which have not been built '
+                 'successfully')
+        group.add_argument(
+            '--packages-select-test-flaky', action='store_true',
+            help='Only process a subset of packages which have both passed '
+                 'and failed tests within their recent test history')
+        parser.add_argument(
+            '--packages-select-failed', metavar='VERB',
+            help='Only process a subset of packages which have failed when '
+                 'the given verb was invoked previously (aborted packages '
+                 'are not considered errors)')
+        parser.add_argument(
+            '--packages-skip-succeeded', metavar='VERB',
+            help='Skip a set of packages which have succeeded when the '
+                 'given verb was invoked previously')
 
     def select_packages(self, args, decorators):  # noqa: D102
         if not any((
             args.packages_select_build_failed,
             args.packages_skip_build_finished,
+            args.packages_skip_build_up_to_date,
+            args.packages_skip_build_cached,
             args.packages_select_test_failures,
             args.packages_skip_test_passed,
+            args.packages_resume,
+            args.packages_select_test_flaky,
+            args.packages_select_failed,
+            args.packages_skip_succeeded,
         )):
             return
 
@@ -53,10 +106,22 @@ class PreviousPackageSelectionExtension(PackageSelectionExtensionPoint):
                 argument = '--packages-select-build-failed'
             elif args.packages_skip_build_finished:
                 argument = '--packages-skip-build-finished'
+            elif args.packages_skip_build_up_to_date:
+                argument = '--packages-skip-build-up-to-date'
+            elif args.packages_skip_build_cached:
+                argument = '--packages-skip-build-cached'
             elif args.packages_select_test_failures:
                 argument = '--packages-select-test-failures'
             elif args.packages_skip_test_passed:
                 argument = '--packages-skip-test-passed'
+            elif args.packages_resume:
+                argument = '--packages-resume'
+            elif args.packages_select_test_flaky:
+                argument = '--packages-select-test-flaky'
+            elif args.packages_select_failed:
+                argument = '--packages-select-failed'
+            elif args.packages_skip_succeeded:
+                argument = '--packages-skip-succeeded'
             else:
                 assert False
             logger.warning(
@@ -66,28 +131,70 @@ class PreviousPackageSelectionExtension(PackageSelectionExtensionPoint):
                 .format_map(locals()))
             return
 
+        if args.packages_select_failed or args.packages_skip_succeeded:
+            _select_by_result_matrix(args, decorators)
+
+        if args.packages_skip_build_cached:
+            cache_path = get_result_cache_path()
+            if cache_path is None:
+                env = RESULT_CACHE_ENVIRONMENT_VARIABLE.name
+                logger.warning(
+                    "Ignoring '--packages-skip-build-cached' since the "
+                    "environment variable '{env}' isn't set"
+                    .format_map(locals()))
+            else:
+                _skip_cached(decorators, cache_path)
+
+        if args.packages_select_test_flaky:
+            test_histories = get_previous_histories(
+                args.build_base, [d.descriptor.name for d in decorators],
+                'test')
+            _select_flaky(decorators, test_histories)
+        else:
+            self._select_by_previous_result(args, decorators)
+
+    def _select_by_previous_result(self, args, decorators):
+        # the module imports asyncio which is expensive and therefore only
+        # done when needed
+        from colcon_core.subprocess import SIGINT_RESULT
+
+        if (
+            args.packages_select_build_failed or
+            args.packages_skip_build_finished or
+            args.packages_skip_build_up_to_date or
+            args.packages_resume
+        ):
+            verb_name = 'build'
+        elif (
+            args.packages_select_test_failures or
+            args.packages_skip_test_passed
+        ):
+            verb_name = 'test'
+        else:
+            return
+
+        previous_results = get_previous_results(
+            args.build_base, [d.descriptor.name for d in decorators],
+            verb_name)
+
+        if args.packages_resume:
+            _select_resume(decorators, previous_results)
+            return
+
+        if args.packages_skip_build_up_to_date:
+            previous_timestamps = get_previous_timestamps(
+                args.build_base, previous_results.keys(), verb_name)
+            _skip_up_to_date(
+                decorators, previous_results, previous_timestamps)
+            return
+
         for decorator in decorators:
             # skip packages which have already been ruled out
             if not decorator.selected:
                 continue
 
             pkg = decorator.descriptor
-
-            if (
-                args.packages_select_build_failed or
-                args.packages_skip_build_finished
-            ):
-                verb_name = 'build'
-            elif (
-                args.packages_select_test_failures or
-                args.packages_skip_test_passed
-            ):
-                verb_name = 'test'
-            else:
-                assert False
-
-            previous_result = get_previous_result(
-                os.path.join(args.build_base, pkg.name), verb_name)
+            previous_result = previous_results[pkg.name]
 
             if args.packages_select_build_failed:
                 package_kind = None
@@ -130,3 +237,156 @@ class PreviousPackageSelectionExtension(PackageSelectionExtensionPoint):
                         "Skipping previously tested package '{pkg.name}' in "
                         "'{pkg.path}'".format_map(locals()))
                     decorator.selected = False
+
+
+def _select_by_result_matrix(args, decorators):
+    # the module imports asyncio which is expensive and therefore only done
+    # when needed
+    from colcon_core.subprocess import SIGINT_RESULT
+
+    matrix = get_result_matrix(args.build_base)
+
+    verb_name = args.packages_select_failed
+    if verb_name:
+        previous_results = matrix.get(verb_name, {})
+        for decorator in decorators:
+            # skip packages which have already been ruled out
+            if not decorator.selected:
+                continue
+
+            pkg = decorator.descriptor
+            previous_result = previous_results.get(pkg.name)
+            package_kind = None
+            if previous_result is None:
+                package_kind = 'not previously processed'
+            elif previous_result == SIGINT_RESULT:
+                package_kind = 'previously aborted'
+            elif previous_result == '0':
+                package_kind = 'previously succeeded'
+            if package_kind is not None:
+                logger.info(
+                    "Skipping {package_kind} package '{pkg.name}' in "
+                    "'{pkg.path}' for verb '{verb_name}'"
+                    .format_map(locals()))
+                decorator.selected = False
+
+    verb_name = args.packages_skip_succeeded
+    if verb_name:
+        previous_results = matrix.get(verb_name, {})
+        for decorator in decorators:
+            # skip packages which have already been ruled out
+            if not decorator.selected:
+                continue
+
+            pkg = decorator.descriptor
+            if previous_results.get(pkg.name) == '0':
+                logger.info(
+                    "Skipping previously succeeded package '{pkg.name}' in "
+                    "'{pkg.path}' for verb '{verb_name}'"
+                    .format_map(locals()))
+                decorator.selected = False
+
+
+def _select_resume(decorators, previous_results):
+    # packages which failed or were aborted, independent of their selection
+    # state to also consider the dependents of skipped packages
+    unfinished = {
+        name for name, result in previous_results.items()
+        if result not in (None, '0')}
+    graph = PackageGraph.from_decorators(decorators)
+    dependents = depending_on(graph, unfinished)
+
+    for decorator in decorators:
+        # skip packages which have already been ruled out
+        if not decorator.selected:
+            continue
+
+        pkg = decorator.descriptor
+        previous_result = previous_results[pkg.name]
+        if pkg.name in unfinished:
+            continue
+        if previous_result is None and pkg.name in dependents:
+            continue
+
+        if previous_result is None:
+            package_kind = 'not previously built'
+        else:
+            package_kind = 'previously built'
+        logger.info(
+            "Skipping {package_kind} package '{pkg.name}' in '{pkg.path}'"
+            .format_map(locals()))
+        decorator.selected = False
+
+
+def _skip_up_to_date(decorators, previous_results, previous_timestamps):
+    graph = PackageGraph.from_decorators(decorators)
+
+    # the newest timestamp of each package or any of its recursive
+    # dependencies, infinite if the package will be (re)built or has never
+    # been built successfully
+    newest = {}
+    for decorator in decorators:
+        pkg = decorator.descriptor
+
+        # the dependencies are ordered before the package itself therefore
+        # only the direct dependencies need to be considered
+        newest_dependency = max(
+            (newest[dep] for dep in graph.get_dependencies(pkg.name)),
+            default=None)
+
+        timestamp = previous_timestamps[pkg.name]
+        if previous_results[pkg.name] != '0' or timestamp is None:
+            newest[pkg.name] = float('inf')
+            continue
+
+        up_to_date = newest_dependency is None or \
+            timestamp > newest_dependency
+        if decorator.selected and up_to_date:
+            logger.info(
+                "Skipping up-to-date package '{pkg.name}' in '{pkg.path}'"
+                .format_map(locals()))
+            decorator.selected = False
+
+        if decorator.selected:
+            newest[pkg.name] = float('inf')
+        elif newest_dependency is None:
+            newest[pkg.name] = timestamp
+        else:
+            newest[pkg.name] = max(timestamp, newest_dependency)
+
+
+def _select_flaky(decorators, histories):
+    for decorator in decorators:
+        # skip packages which have already been ruled out
+        if not decorator.selected:
+            continue
+
+        pkg = decorator.descriptor
+        outcomes = {
+            entry.outcome for entry in histories[pkg.name]
+            if entry.outcome != OUTCOME_ABORTED}
+        if OUTCOME_SUCCESS in outcomes and len(outcomes) > 1:
+            continue
+
+        logger.info(
+            "Skipping not flaky package '{pkg.name}' in '{pkg.path}'"
+            .format_map(locals()))
+        decorator.selected = False
+
+
+def _skip_cached(decorators, cache_path):
+    # only the keys of selected packages and their recursive dependencies are
+    # needed which avoids reading the sources of all other packages
+    package_keys = get_package_keys(
+        decorators, [d.descriptor.name for d in decorators if d.selected])
+    for decorator in decorators:
+        # skip packages which have already been ruled out
+        if not decorator.selected:
+            continue
+
+        pkg = decorator.descriptor
+        if has_cached_result(cache_path, package_keys[pkg.name]):
+            logger.info(
+                "Skipping cached package '{pkg.name}' in '{pkg.path}'"
+                .format_map(locals()))
+            decorator.selected = False
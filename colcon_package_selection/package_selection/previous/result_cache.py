@@ -0,0 +1,259 @@
+# Copyright 2026 Dirk Thomas
+# Licensed under the Apache License, Version 2.0
+
+import os
+import pathlib
+
+from colcon_core.environment_variable import EnvironmentVariable
+
+"""Environment variable to set the path of a shared result cache"""
+RESULT_CACHE_ENVIRONMENT_VARIABLE = EnvironmentVariable(
+    'COLCON_RESULT_CACHE',
+    'Set the path of a directory (which can be shared between multiple '
+    'machines) to record successfully built packages in')
+
+"""Environment variable to set the maximum number of cache entries"""
+RESULT_CACHE_SIZE_ENVIRONMENT_VARIABLE = EnvironmentVariable(
+    'COLCON_RESULT_CACHE_SIZE',
+    'Set the maximum number of entries in the result cache, the least '
+    'recently used entries are being evicted (default: 100000)')
+
+DEFAULT_RESULT_CACHE_SIZE = 100000
+
+KEY_FILENAME = 'colcon_{verb_name}.key'
+
+# directories generated within the source directory, e.g. by running tests
+IGNORED_DIRECTORY_NAMES = frozenset(('__pycache__', ))
+IGNORED_DIRECTORY_SUFFIXES = ('.egg-info', )
+
+
+def get_result_cache_path():
+    """
+    Get the path of the shared result cache.
+
+    :returns: The path if the environment variable is set, otherwise None
+    :rtype: :py:class:`pathlib.Path`
+    """
+    path = os.environ.get(RESULT_CACHE_ENVIRONMENT_VARIABLE.name)
+    if not path:
+        return None
+    return pathlib.Path(path)
+
+
+def get_result_cache_size():
+    """
+    Get the maximum number of entries in the shared result cache.
+
+    :returns: The value of the environment variable if it is a positive
+      integer, otherwise the default size
+    :rtype: int
+    """
+    value = os.environ.get(RESULT_CACHE_SIZE_ENVIRONMENT_VARIABLE.name)
+    try:
+        size = int(value)
+    except (TypeError, ValueError):
+        return DEFAULT_RESULT_CACHE_SIZE
+    if size < 1:
+        return DEFAULT_RESULT_CACHE_SIZE
+    return size
+
+
+def get_source_fingerprint(path):
+    """
+    Get a fingerprint of the content of a package source directory.
+
+    Hidden files and directories as well as directories generated within
+    the source directory are being ignored.
+
+    :param str path: The package source directory
+    :returns: The hex digest of the relative paths and the content of all
+      files
+    :rtype: str
+    """
+    import hashlib
+
+    digest = hashlib.sha256()
+    for dirpath, dirnames, filenames in os.walk(str(path)):
+        dirnames[:] = sorted(
+            d for d in dirnames
+            if not d.startswith('.') and
+            d not in IGNORED_DIRECTORY_NAMES and
+            not d.endswith(IGNORED_DIRECTORY_SUFFIXES))
+        for filename in sorted(filenames):
+            if filename.startswith('.'):
+                continue
+            file_path = os.path.join(dirpath, filename)
+            rel_path = os.path.relpath(file_path, str(path))
+            digest.update(rel_path.replace(os.sep, '/').encode() + b'\0')
+            try:
+                with open(file_path, 'rb') as h:
+                    for chunk in iter(lambda: h.read(1 << 16), b''):
+                        digest.update(chunk)
+            except OSError:
+                # e.g. broken symbolic links
+                pass
+            digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def get_package_keys(decorators, pkg_names=None):
+    """
+    Get the cache keys of packages.
+
+    The key of each package is a hash of the package name, its source
+    fingerprint and the keys of its dependencies.
+    Therefore a change in any recursive dependency changes the key.
+
+    :param list decorators: The package decorators in topological order
+    :param Iterable[str] pkg_names: The package names to compute the keys
+      for, the keys of their recursive dependencies are computed as well, if
+      None the keys of all packages are computed
+    :returns: The key for each requested package name and its recursive
+      dependencies
+    :rtype: dict
+    """
+    import hashlib
+
+    needed = {d.descriptor.name for d in decorators}
+    if pkg_names is not None:
+        needed = set(pkg_names)
+        for decorator in decorators:
+            if decorator.descriptor.name in needed:
+                needed.update(decorator.recursive_dependencies or ())
+
+    keys = {}
+    for decorator in decorators:
+        pkg = decorator.descriptor
+        if pkg.name not in needed:
+            continue
+        # only the dependencies considered by the invoked verb are part of
+        # the key independent of which other keys have been computed
+        recursive_dependencies = set(decorator.recursive_dependencies or ())
+        digest = hashlib.sha256()
+        digest.update(pkg.name.encode() + b'\0')
+        digest.update(get_source_fingerprint(pkg.path).encode() + b'\0')
+        for dep in sorted({
+            str(d) for d in pkg.get_dependencies()
+            if d in recursive_dependencies and d in keys
+        }):
+            digest.update(dep.encode() + b'\0' + keys[dep].encode() + b'\0')
+        keys[pkg.name] = digest.hexdigest()
+    return keys
+
+
+def get_package_key(package_build_base, verb_name):
+    """
+    Get the cache key recorded in the package build directory.
+
+    :param str package_build_base: The build directory of a package
+    :param str verb_name: The invoked verb name
+    :returns: The key, otherwise None
+    :rtype: str
+    """
+    path = pathlib.Path(package_build_base) / \
+        KEY_FILENAME.format_map(locals())
+    try:
+        return path.read_text().rstrip() or None
+    except FileNotFoundError:
+        return None
+
+
+def set_package_key(package_build_base, verb_name, key):
+    """
+    Record the cache key in the package build directory.
+
+    :param str package_build_base: The build directory of a package
+    :param str verb_name: The invoked verb name
+    :param str key: The cache key
+    """
+    path = pathlib.Path(package_build_base) / \
+        KEY_FILENAME.format_map(locals())
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(key + '\n')
+
+
+def has_cached_result(cache_path, key):
+    """
+    Check if a successful result has been recorded for a key.
+
+    A hit updates the modification time of the entry to track its usage.
+
+    :param cache_path: The path of the result cache
+    :param str key: The cache key
+    :rtype: bool
+    """
+    path = _get_entry_path(cache_path, key)
+    try:
+        os.utime(str(path))
+    except FileNotFoundError:
+        return False
+    except OSError:
+        # e.g. a read-only cache
+        return path.exists()
+    return True
+
+
+def publish_result(cache_path, key, content=''):
+    """
+    Record a successful result for a key.
+
+    The entry is written to a temporary file first and then renamed which is
+    atomic and doesn't require any locking between concurrent writers.
+
+    :param cache_path: The path of the result cache
+    :param str key: The cache key
+    :param str content: Informational content of the entry
+    """
+    import tempfile
+
+    path = _get_entry_path(cache_path, key)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(
+        dir=str(path.parent), prefix='.' + key + '.', suffix='.tmp')
+    replaced = False
+    try:
+        with os.fdopen(fd, 'w') as h:
+            h.write(content)
+        os.replace(tmp_path, str(path))
+        replaced = True
+    finally:
+        if not replaced:
+            os.remove(tmp_path)
+
+
+def evict_results(cache_path, max_entries):
+    """
+    Remove the least recently used entries exceeding the maximum size.
+
+    Entries which have been removed concurrently are being ignored.
+
+    :param cache_path: The path of the result cache
+    :param int max_entries: The maximum number of entries to keep
+    """
+    entries = []
+    try:
+        buckets = list(os.scandir(str(cache_path)))
+    except FileNotFoundError:
+        return
+    for bucket in buckets:
+        if bucket.name.startswith('.') or not bucket.is_dir():
+            continue
+        for entry in os.scandir(bucket.path):
+            if entry.name.startswith('.'):
+                continue
+            try:
+                entries.append((entry.stat().st_mtime, entry.path))
+            except FileNotFoundError:
+                pass
+    if len(entries) <= max_entries:
+        return
+    entries.sort()
+    for _, path in entries[:len(entries) - max_entries]:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def _get_entry_path(cache_path, key):
+    return pathlib.Path(cache_path) / key[:2] / key
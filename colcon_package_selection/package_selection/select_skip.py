@@ -9,6 +9,7 @@ from colcon_core.package_selection import PackageSelectionExtensionPoint
 from colcon_core.plugin_system import satisfies_version
 from colcon_package_selection.argument import argument_package_name
 from colcon_package_selection.argument import argument_valid_regex
+from colcon_package_selection.engine import match
 
 
 class SelectSkipPackageSelectionExtension(PackageSelectionExtensionPoint):
@@ -71,6 +72,21 @@ class SelectSkipPackageSelectionExtension(PackageSelectionExtensionPoint):
                     'of the package names'.format_map(locals()))
 
     def select_packages(self, args, decorators):  # noqa: D102
+        pkg_names = [d.descriptor.name for d in decorators]
+
+        skip_pkgs = set(args.packages_skip or [])
+        if args.packages_skip_regex:
+            skip_pkgs |= match(pkg_names, args.packages_skip_regex)
+
+        select_pkgs = None
+        if (
+            args.packages_select is not None or
+            args.packages_select_regex is not None
+        ):
+            select_pkgs = set(args.packages_select or [])
+            if args.packages_select_regex:
+                select_pkgs |= match(pkg_names, args.packages_select_regex)
+
         for decorator in decorators:
             # skip packages which have already been ruled out
             if not decorator.selected:
@@ -78,30 +94,14 @@ class SelectSkipPackageSelectionExtension(PackageSelectionExtensionPoint):
 
             pkg = decorator.descriptor
 
-            if (
-                pkg.name in (args.packages_skip or []) or
-                any(
-                    re.match(pattern, pkg.name)
-                    for pattern in (args.packages_skip_regex or [])
-                )
-            ):
+            if pkg.name in skip_pkgs:
                 logger.info(
                     "Skipping package '{pkg.name}' in '{pkg.path}'"
                     .format_map(locals()))
                 decorator.selected = False
 
-            elif (
-                args.packages_select is not None or
-                args.packages_select_regex is not None
-            ):
-                if (
-                    pkg.name not in (args.packages_select or []) and
-                    not any(
-                        re.match(pattern, pkg.name)
-                        for pattern in (args.packages_select_regex or [])
-                    )
-                ):
-                    logger.info(
-                        "Skipping not selected package '{pkg.name}' in "
-                        "'{pkg.path}'".format_map(locals()))
-                    decorator.selected = False
+            elif select_pkgs is not None and pkg.name not in select_pkgs:
+                logger.info(
+                    "Skipping not selected package '{pkg.name}' in "
+                    "'{pkg.path}'".format_map(locals()))
+                decorator.selected = False
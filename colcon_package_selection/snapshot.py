@@ -0,0 +1,282 @@
+# Copyright 2026 Dirk Thomas
+# Licensed under the Apache License, Version 2.0
+
+"""
+Persist a :py:class:`colcon_package_selection.engine.PackageGraph`.
+
+The snapshot is a compact binary file containing the package names and paths
+in topological order as well as the dependencies as integer arrays.
+A digest of the names, paths and direct dependencies identifies the graph.
+For each package a signature of the files in the package directory (e.g. the
+manifest) is stored to cheaply detect if the snapshot is stale.
+Packages which have been added to the workspace since the snapshot has been
+written are not detected by that check.
+Neither are dependencies declared outside of the package directories, e.g.
+in a `colcon.meta` file.
+
+The snapshot is therefore only meant for tools which query a graph without
+running the package discovery.
+The package selection extensions always create the graph from the package
+decorators.
+Only when requested with `--packages-write-graph-snapshot` the graph of the
+invoked verb is written to the build base, one file per verb since each verb
+considers different dependency categories.
+"""
+
+import os
+import pathlib
+import struct
+import sys
+
+from colcon_package_selection.engine import PackageGraph
+
+SNAPSHOT_FILENAME = 'colcon_package_graph_{verb_name}.bin'
+
+_MAGIC = b'CPSG'
+_VERSION = 2
+
+# magic, version, number of packages, number of direct dependencies,
+# number of recursive dependencies, length of names, length of paths,
+# digest of the graph
+_HEADER = struct.Struct('<4sIIIIII32s')
+
+# the integer arrays are aligned to 8 bytes
+_HEADER_SIZE = 64
+
+_UNKNOWN_DEPTH = 0xffffffff
+
+
+def get_manifest_signature(path):
+    """
+    Get a signature of the files directly within a package directory.
+
+    Only the names, sizes and modification times are considered and no file
+    content is being read.
+
+    :param str path: The package directory
+    :returns: The signature, 0 if the directory doesn't exist
+    :rtype: int
+    """
+    import hashlib
+
+    digest = hashlib.sha256()
+    try:
+        entries = sorted(os.scandir(str(path)), key=lambda e: e.name)
+    except OSError:
+        return 0
+    for entry in entries:
+        try:
+            if not entry.is_file():
+                continue
+            stat = entry.stat()
+        except OSError:
+            continue
+        digest.update(
+            '{entry.name}\0{stat.st_size}\0{stat.st_mtime_ns}\0'
+            .format_map(locals()).encode())
+    return int.from_bytes(digest.digest()[:8], 'little')
+
+
+def get_graph_digest(graph):
+    """
+    Get a digest of the names, paths and direct dependencies of a graph.
+
+    The recursive dependencies and depths are derived from the direct
+    dependencies and therefore aren't needed.
+
+    :param graph: The :py:class:`colcon_package_selection.engine.PackageGraph`
+    :rtype: bytes
+    """
+    import hashlib
+
+    digest = hashlib.sha256()
+    for name, path, dependencies in zip(
+        graph.names, graph.paths, graph.dependency_indices,
+    ):
+        digest.update(
+            '{name}\0{path}\0{dependencies}\0'.format_map(locals()).encode())
+    return digest.digest()
+
+
+def write_snapshot(path, graph):
+    """
+    Write a snapshot of a package graph.
+
+    The file is written to a temporary file first and then renamed.
+
+    :param str path: The path of the snapshot file
+    :param graph: The :py:class:`colcon_package_selection.engine.PackageGraph`
+    """
+    import tempfile
+
+    names = [n.encode() for n in graph.names]
+    paths = [p.encode() for p in graph.paths]
+    signatures = [get_manifest_signature(p) for p in graph.paths]
+
+    def offsets(items):
+        result = [0]
+        for item in items:
+            result.append(result[-1] + len(item))
+        return result
+
+    dependency_offsets = offsets(graph.dependency_indices)
+    recursive_offsets = offsets(graph.recursive_dependency_indices)
+    name_offsets = offsets(names)
+    path_offsets = offsets(paths)
+
+    def pack(fmt, values):
+        return struct.pack('<{}{}'.format(len(values), fmt), *values)
+
+    data = [
+        _HEADER.pack(
+            _MAGIC, _VERSION, len(names), dependency_offsets[-1],
+            recursive_offsets[-1], name_offsets[-1], path_offsets[-1],
+            get_graph_digest(graph)),
+        b'\0' * (_HEADER_SIZE - _HEADER.size),
+        pack('Q', signatures),
+        pack('I', dependency_offsets),
+        pack('I', [i for d in graph.dependency_indices for i in d]),
+        pack('I', recursive_offsets),
+        pack('I', [i for d in graph.recursive_dependency_indices for i in d]),
+        pack('I', [
+            _UNKNOWN_DEPTH if depth is None else depth
+            for d in graph.depths for depth in d]),
+        pack('I', name_offsets),
+        pack('I', path_offsets),
+        b''.join(names),
+        b''.join(paths),
+    ]
+
+    path = pathlib.Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(
+        dir=str(path.parent), prefix='.' + path.name + '.', suffix='.tmp')
+    replaced = False
+    try:
+        with os.fdopen(fd, 'wb') as h:
+            h.write(b''.join(data))
+        os.replace(tmp_path, str(path))
+        replaced = True
+    finally:
+        if not replaced:
+            os.remove(tmp_path)
+
+
+def load_snapshot(path, *, validate=True):
+    """
+    Load a snapshot of a package graph.
+
+    :param str path: The path of the snapshot file
+    :param bool validate: The flag if the manifest signature of each package
+      should be checked
+    :returns: The :py:class:`colcon_package_selection.engine.PackageGraph`,
+      None if the snapshot doesn't exist, is invalid or stale
+    """
+    import mmap
+
+    try:
+        with open(str(path), 'rb') as h:
+            with mmap.mmap(h.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                return _parse_snapshot(memoryview(m), validate)
+    except (OSError, ValueError, struct.error):
+        return None
+
+
+def is_snapshot_current(path, graph):
+    """
+    Check if a snapshot matches a package graph.
+
+    Only the header and the manifest signatures are being read and the depths
+    of the graph aren't needed.
+
+    :param str path: The path of the snapshot file
+    :param graph: The :py:class:`colcon_package_selection.engine.PackageGraph`
+    :returns: True if the snapshot exists, was written for the same graph and
+      the manifest signatures are still valid, otherwise False
+    :rtype: bool
+    """
+    size = _HEADER_SIZE + 8 * len(graph)
+    try:
+        with open(str(path), 'rb') as h:
+            data = h.read(size)
+        magic, version, count, *_, digest = _HEADER.unpack_from(data)
+    except (OSError, struct.error):
+        return False
+    if (
+        magic != _MAGIC or version != _VERSION or count != len(graph) or
+        len(data) != size or digest != get_graph_digest(graph)
+    ):
+        return False
+    signatures = struct.unpack_from('<{}Q'.format(count), data, _HEADER_SIZE)
+    return all(
+        get_manifest_signature(p) == signature
+        for p, signature in zip(graph.paths, signatures))
+
+
+def _parse_snapshot(buffer, validate):
+    try:
+        magic, version, count, dependency_count, recursive_count, \
+            names_length, paths_length, _ = _HEADER.unpack_from(buffer)
+        if magic != _MAGIC or version != _VERSION:
+            return None
+
+        offset = _HEADER_SIZE
+
+        def read(fmt, length):
+            nonlocal offset
+            size = struct.calcsize(fmt) * length
+            # release the views immediately to allow closing the mapping
+            with buffer[offset:offset + size] as view:
+                if len(view) != size:
+                    raise ValueError('truncated snapshot')
+                offset += size
+                if sys.byteorder == 'little':
+                    with view.cast(fmt) as values:
+                        return values.tolist()
+                return list(struct.unpack('<{}{}'.format(length, fmt), view))
+
+        signatures = read('Q', count)
+        dependency_offsets = read('I', count + 1)
+        dependencies = read('I', dependency_count)
+        recursive_offsets = read('I', count + 1)
+        recursive_dependencies = read('I', recursive_count)
+        depths = read('I', recursive_count)
+        name_offsets = read('I', count + 1)
+        path_offsets = read('I', count + 1)
+        names_blob = bytes(buffer[offset:offset + names_length])
+        offset += names_length
+        paths_blob = bytes(buffer[offset:offset + paths_length])
+        if (
+            len(names_blob) != names_length or
+            len(paths_blob) != paths_length
+        ):
+            raise ValueError('truncated snapshot')
+    finally:
+        buffer.release()
+
+    paths = [
+        paths_blob[path_offsets[i]:path_offsets[i + 1]].decode()
+        for i in range(count)]
+    if validate:
+        for path, signature in zip(paths, signatures):
+            if get_manifest_signature(path) != signature:
+                return None
+
+    return PackageGraph(
+        [
+            names_blob[name_offsets[i]:name_offsets[i + 1]].decode()
+            for i in range(count)],
+        paths,
+        [
+            dependencies[dependency_offsets[i]:dependency_offsets[i + 1]]
+            for i in range(count)],
+        [
+            recursive_dependencies[
+                recursive_offsets[i]:recursive_offsets[i + 1]]
+            for i in range(count)],
+        [
+            [
+                None if depth == _UNKNOWN_DEPTH else depth
+                for depth in depths[
+                    recursive_offsets[i]:recursive_offsets[i + 1]]]
+            for i in range(count)])
@@ -0,0 +1,88 @@
+# Copyright 2026 Dirk Thomas
+# Licensed under the Apache License, Version 2.0
+
+import argparse
+import os
+
+from colcon_core.dependency_descriptor import DependencyDescriptor
+from colcon_core.executor import Job
+from colcon_core.package_descriptor import PackageDescriptor
+from colcon_core.task import TaskContext
+from colcon_core.task import TaskExtensionPoint
+from colcon_core.topological_order import topological_order_packages
+import pytest
+
+
+@pytest.fixture
+def create_decorators():
+    """Get a function creating topologically ordered package decorators."""
+    def create(dependencies, *, root='/some/path'):
+        descriptors = set()
+        for name, dependency_names in dependencies.items():
+            descriptor = PackageDescriptor(os.path.join(str(root), name))
+            descriptor.name = name
+            descriptor.type = 'python'
+            descriptor.dependencies['build'] = {
+                DependencyDescriptor(dep) for dep in dependency_names}
+            descriptors.add(descriptor)
+        return topological_order_packages(descriptors)
+    return create
+
+
+@pytest.fixture
+def create_job():
+    """Get a function creating the job of a verb for a package."""
+    def create(name, build_base, verb_name, **attributes):
+        task = TaskExtensionPoint()
+        task.TASK_NAME = verb_name
+        pkg = PackageDescriptor(str(build_base / 'src' / name))
+        pkg.name = name
+        pkg.type = 'python'
+        args = argparse.Namespace(
+            build_base=str(build_base / name), **attributes)
+        task_context = TaskContext(pkg=pkg, args=args, dependencies={})
+        return Job(
+            identifier=name, dependencies=set(), task=task,
+            task_context=task_context)
+    return create
+
+
+@pytest.fixture
+def example_dependencies():
+    """Get the dependencies of the packages of an example workspace."""
+    # a -> b -> c -> f <- e <- d, z without any dependencies
+    return {
+        'a': [],
+        'b': ['a'],
+        'c': ['b'],
+        'd': [],
+        'e': ['d'],
+        'f': ['c', 'e'],
+        'z': [],
+    }
+
+
+@pytest.fixture
+def diamond_dependencies():
+    """Get the dependencies of the packages of a diamond shaped workspace."""
+    # a diamond a -> b, c -> d and e depending on both a and d
+    return {
+        'a': [],
+        'b': ['a'],
+        'c': ['a'],
+        'd': ['b', 'c'],
+        'e': ['a', 'd'],
+    }
+
+
+@pytest.fixture
+def parse_args():
+    """Get a function parsing the arguments of a selection extension."""
+    def parse(extension, argv, **attributes):
+        parser = argparse.ArgumentParser()
+        extension.add_arguments(parser=parser)
+        args = parser.parse_args(argv)
+        for name, value in attributes.items():
+            setattr(args, name, value)
+        return args
+    return parse
@@ -0,0 +1,106 @@
+# Copyright 2026 Dirk Thomas
+# Licensed under the Apache License, Version 2.0
+
+import os
+
+from colcon_package_selection.package_selection.budget \
+    import _choose_packages
+from colcon_package_selection.package_selection.budget \
+    import BudgetPackageSelection
+from colcon_package_selection.package_selection.previous \
+    import add_history_entry
+from colcon_package_selection.package_selection.previous \
+    import HistoryEntry
+from colcon_package_selection.package_selection.previous \
+    import OUTCOME_FAILURE
+from colcon_package_selection.package_selection.previous \
+    import OUTCOME_SUCCESS
+import pytest
+
+DURATIONS = {
+    'a': 10.0, 'b': 10.0, 'c': 10.0, 'd': 5.0, 'e': 5.0, 'f': 30.0,
+    'z': 50.0,
+}
+
+
+@pytest.fixture
+def choose(create_decorators, example_dependencies):
+    def choose(
+        budget, *, workers=1, failed=(), priority_names=(), selected=None,
+    ):
+        decorators = create_decorators(example_dependencies)
+        for decorator in decorators:
+            if selected is not None:
+                decorator.selected = decorator.descriptor.name in selected
+        return _choose_packages(
+            decorators, DURATIONS, failed, priority_names, budget, workers)
+    return choose
+
+
+def test_cheapest_first(choose, example_dependencies):
+    assert choose(5) == {'d'}
+    assert choose(20) == {'a', 'd', 'e'}
+    assert choose(1000) == set(example_dependencies.keys())
+
+
+def test_priority_order(choose):
+    # packages passed to --packages-up-to first, then failed packages
+    assert choose(30, priority_names=['c']) == {'a', 'b', 'c'}
+    assert choose(15, failed=['e']) == {'d', 'e'}
+    assert choose(40, failed=['e'], priority_names=['c']) == \
+        {'a', 'b', 'c', 'd', 'e'}
+    # a prioritized package which doesn't fit is skipped
+    assert choose(20, priority_names=['c']) == {'a', 'd', 'e'}
+
+
+def test_dependency_closure(choose):
+    # the selected recursive dependencies are chosen together
+    chosen = choose(30, priority_names=['f'])
+    assert 'f' not in chosen
+    chosen = choose(70, priority_names=['f'])
+    assert chosen == {'a', 'b', 'c', 'd', 'e', 'f'}
+    # dependencies which aren't selected don't count against the budget
+    chosen = choose(45, priority_names=['f'], selected={'c', 'e', 'f'})
+    assert chosen == {'c', 'e', 'f'}
+
+
+def test_workers(choose):
+    assert choose(30) == {'a', 'b', 'd', 'e'}
+    assert choose(30, workers=2) == {'a', 'b', 'c', 'd', 'e'}
+
+
+def test_critical_path(choose, example_dependencies):
+    # the chain a -> b -> c -> f takes 60 even with unlimited workers
+    chosen = choose(50, workers=100)
+    assert chosen == {'a', 'b', 'c', 'd', 'e', 'z'}
+    chosen = choose(60, workers=100)
+    assert chosen == set(example_dependencies.keys())
+
+
+@pytest.mark.parametrize(
+    'value', ['nan', 'inf', '-inf', '0', '-1', 'one'])
+def test_invalid_budget(parse_args, value):
+    extension = BudgetPackageSelection()
+    with pytest.raises(SystemExit):
+        parse_args(extension, ['--packages-select-budget', value])
+
+
+def test_extension(
+    create_decorators, example_dependencies, parse_args, tmp_path,
+):
+    for name, duration in DURATIONS.items():
+        add_history_entry(
+            os.path.join(str(tmp_path), name), 'build',
+            HistoryEntry(0.0, duration, OUTCOME_SUCCESS))
+    add_history_entry(
+        os.path.join(str(tmp_path), 'e'), 'build',
+        HistoryEntry(1.0, 5.0, OUTCOME_FAILURE))
+
+    extension = BudgetPackageSelection()
+    args = parse_args(
+        extension, ['--packages-select-budget', '20'],
+        build_base=str(tmp_path), verb_name='build')
+    decorators = create_decorators(example_dependencies)
+    extension.select_packages(args, decorators)
+    assert [d.descriptor.name for d in decorators if d.selected] == \
+        ['a', 'd', 'e']
@@ -0,0 +1,123 @@
+# Copyright 2026 Dirk Thomas
+# Licensed under the Apache License, Version 2.0
+
+from colcon_package_selection.package_selection.dependencies \
+    import DependenciesPackageSelection
+import pytest
+
+
+@pytest.fixture
+def select(create_decorators, example_dependencies, parse_args):
+    def select(argv, *, deselected=()):
+        extension = DependenciesPackageSelection()
+        args = parse_args(extension, argv)
+        decorators = create_decorators(example_dependencies)
+        for decorator in decorators:
+            if decorator.descriptor.name in deselected:
+                decorator.selected = False
+        extension.check_parameters(args, set(example_dependencies.keys()))
+        extension.select_packages(args, decorators)
+        return {d.descriptor.name for d in decorators if d.selected}
+    return select
+
+
+def test_no_arguments(select, example_dependencies):
+    assert select([]) == set(example_dependencies.keys())
+    # the depth alone doesn't select anything
+    assert select(['--packages-above-depth', '1']) == \
+        set(example_dependencies.keys())
+
+
+def test_up_to(select):
+    assert select(['--packages-up-to', 'c']) == {'a', 'b', 'c'}
+    assert select(['--packages-up-to', 'e', 'z']) == {'d', 'e', 'z'}
+    assert select(['--packages-up-to', 'f']) == \
+        {'a', 'b', 'c', 'd', 'e', 'f'}
+    # packages which have already been ruled out stay deselected
+    assert select(['--packages-up-to', 'c'], deselected={'b'}) == {'a', 'c'}
+
+
+def test_up_to_regex(select):
+    assert select(['--packages-up-to-regex', '[ce]']) == \
+        {'a', 'b', 'c', 'd', 'e'}
+    assert select(['--packages-up-to-regex', 'e', 'z']) == {'d', 'e', 'z'}
+
+
+def test_above(select):
+    assert select(['--packages-above', 'a']) == {'a', 'b', 'c', 'f'}
+    assert select(['--packages-above', 'd', 'z']) == {'d', 'e', 'f', 'z'}
+    assert select(['--packages-above', 'a'], deselected={'c'}) == \
+        {'a', 'b', 'f'}
+
+
+def test_above_and_dependencies(select):
+    assert select(['--packages-above-and-dependencies', 'e']) == \
+        {'a', 'b', 'c', 'd', 'e', 'f'}
+    assert select(['--packages-above-and-dependencies', 'z']) == {'z'}
+    assert select(
+        ['--packages-above-and-dependencies', 'c'], deselected={'a', 'f'}
+    ) == {'b', 'c', 'd', 'e'}
+
+
+def test_above_depth(select):
+    assert select(['--packages-above-depth', '0', 'a']) == {'a'}
+    assert select(['--packages-above-depth', '1', 'a']) == {'a', 'b'}
+    assert select(['--packages-above-depth', '3', 'a']) == \
+        {'a', 'b', 'c', 'f'}
+    assert select(['--packages-above-depth', '1', 'a', 'd']) == \
+        {'a', 'b', 'd', 'e'}
+    assert select(
+        ['--packages-above-depth', '1', 'a', 'd'], deselected={'a'}
+    ) == {'b', 'd', 'e'}
+
+
+@pytest.mark.parametrize('depth', ['-1', 'one'])
+def test_invalid_above_depth(parse_args, depth):
+    with pytest.raises(SystemExit):
+        parse_args(
+            DependenciesPackageSelection(),
+            ['--packages-above-depth', depth, 'a'])
+
+
+def test_select_by_dep(select):
+    assert select(['--packages-select-by-dep', 'b']) == {'c', 'f'}
+    # the passed packages are only selected if they depend on each other
+    assert select(['--packages-select-by-dep', 'a', 'b']) == \
+        {'b', 'c', 'f'}
+    assert select(['--packages-select-by-dep', 'z']) == set()
+    assert select(['--packages-select-by-dep', 'd'], deselected={'f'}) == \
+        {'e'}
+
+
+def test_skip_by_dep(select):
+    assert select(['--packages-skip-by-dep', 'd']) == \
+        {'a', 'b', 'c', 'd', 'z'}
+    assert select(['--packages-skip-by-dep', 'd'], deselected={'a'}) == \
+        {'b', 'c', 'd', 'z'}
+
+
+def test_skip_up_to(select):
+    assert select(['--packages-skip-up-to', 'c']) == {'d', 'e', 'f', 'z'}
+    assert select(['--packages-skip-up-to', 'c'], deselected={'z'}) == \
+        {'d', 'e', 'f'}
+
+
+def test_combined(select):
+    assert select([
+        '--packages-up-to', 'f', '--packages-skip-up-to', 'b',
+    ]) == {'c', 'd', 'e', 'f'}
+    assert select([
+        '--packages-above', 'a', '--packages-skip-by-dep', 'c',
+    ]) == {'a', 'b', 'c'}
+
+
+@pytest.mark.parametrize('argv', [
+    ['--packages-up-to', 'unknown'],
+    ['--packages-up-to-regex', 'unknown'],
+    ['--packages-above', 'unknown'],
+    ['--packages-above-and-dependencies', 'unknown'],
+    ['--packages-above-depth', '1', 'unknown'],
+])
+def test_unknown_package(select, argv):
+    with pytest.raises(SystemExit):
+        select(argv)
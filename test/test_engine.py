@@ -0,0 +1,123 @@
+# Copyright 2026 Dirk Thomas
+# Licensed under the Apache License, Version 2.0
+
+import re
+
+from colcon_package_selection.engine import above
+from colcon_package_selection.engine import above_and_dependencies
+from colcon_package_selection.engine import depending_on
+from colcon_package_selection.engine import get_layers
+from colcon_package_selection.engine import in_layers
+from colcon_package_selection.engine import match
+from colcon_package_selection.engine import PackageGraph
+from colcon_package_selection.engine import up_to
+import pytest
+
+
+@pytest.fixture
+def create_graph(create_decorators, example_dependencies):
+    def create(dependencies=None):
+        if dependencies is None:
+            dependencies = example_dependencies
+        return PackageGraph.from_decorators(create_decorators(dependencies))
+    return create
+
+
+def test_graph(create_graph, example_dependencies):
+    graph = create_graph()
+    assert len(graph) == len(example_dependencies)
+    assert set(graph) == set(example_dependencies.keys())
+    assert 'a' in graph
+    assert 'unknown' not in graph
+    assert graph.get_path('f') == '/some/path/f'
+    assert graph.get_dependencies('f') == {'c', 'e'}
+    assert graph.get_recursive_dependencies('f') == {'a', 'b', 'c', 'd', 'e'}
+    for name in graph.names:
+        index = graph.get_index(name)
+        assert all(
+            i < index for i in graph.recursive_dependency_indices[index])
+
+
+def test_up_to(create_graph):
+    graph = create_graph()
+    assert up_to(graph, []) == set()
+    assert up_to(graph, ['c']) == {'a', 'b', 'c'}
+    assert up_to(graph, ['c', 'e']) == {'a', 'b', 'c', 'd', 'e'}
+    assert up_to(graph, ['f']) == {'a', 'b', 'c', 'd', 'e', 'f'}
+    assert up_to(graph, ['z', 'unknown']) == {'z'}
+
+
+def test_above(create_graph):
+    graph = create_graph()
+    assert above(graph, []) == set()
+    assert above(graph, ['a']) == {'a', 'b', 'c', 'f'}
+    assert above(graph, ['d', 'z']) == {'d', 'e', 'f', 'z'}
+    assert above(graph, ['f', 'unknown']) == {'f'}
+
+
+def test_above_depth(create_graph):
+    graph = create_graph()
+    assert above(graph, ['a'], depth=0) == {'a'}
+    assert above(graph, ['a'], depth=1) == {'a', 'b'}
+    assert above(graph, ['a'], depth=2) == {'a', 'b', 'c'}
+    assert above(graph, ['a'], depth=3) == {'a', 'b', 'c', 'f'}
+    assert above(graph, ['a', 'd'], depth=1) == {'a', 'b', 'd', 'e'}
+
+
+def test_above_depth_shortest_path(create_graph):
+    # the depth is the length of the shortest path
+    graph = create_graph({'a': [], 'b': ['a'], 'c': ['a', 'b']})
+    assert above(graph, ['a'], depth=1) == {'a', 'b', 'c'}
+    assert above(graph, ['b'], depth=0) == {'b'}
+
+
+def test_above_and_dependencies(create_graph):
+    graph = create_graph()
+    assert above_and_dependencies(graph, []) == set()
+    assert above_and_dependencies(graph, ['e']) == \
+        {'a', 'b', 'c', 'd', 'e', 'f'}
+    assert above_and_dependencies(graph, ['b']) == \
+        {'a', 'b', 'c', 'd', 'e', 'f'}
+    assert above_and_dependencies(graph, ['z']) == {'z'}
+
+
+def test_depending_on(create_graph):
+    graph = create_graph()
+    assert depending_on(graph, []) == set()
+    assert depending_on(graph, ['b']) == {'c', 'f'}
+    assert depending_on(graph, ['a', 'b']) == {'b', 'c', 'f'}
+    assert depending_on(graph, ['f', 'z']) == set()
+    assert depending_on(graph, ['d', 'unknown']) == {'e', 'f'}
+
+
+def test_match(create_graph):
+    graph = create_graph()
+    assert match(graph, []) == set()
+    assert match(graph, ['[a-c]']) == {'a', 'b', 'c'}
+    assert match(graph, [re.compile('e'), 'z']) == {'e', 'z'}
+    # the pattern must match at the beginning of the name
+    assert match(graph, ['.e']) == set()
+    assert match(graph, ['unknown']) == set()
+    # any iterable of names is sufficient
+    assert match(['a', 'b', 'ab'], ['a']) == {'a', 'ab'}
+
+
+def test_get_layers(create_graph, diamond_dependencies):
+    graph = create_graph()
+    assert get_layers(graph) == {
+        'a': 0, 'b': 1, 'c': 2, 'd': 0, 'e': 1, 'f': 3, 'z': 0}
+
+    # the layer is determined by the longest path, e is a direct dependent of
+    # a but also depends on d
+    graph = create_graph(diamond_dependencies)
+    assert get_layers(graph) == {'a': 0, 'b': 1, 'c': 1, 'd': 2, 'e': 3}
+
+
+def test_in_layers(create_graph, diamond_dependencies):
+    graph = create_graph(diamond_dependencies)
+    assert in_layers(graph, 0, 0) == {'a'}
+    assert in_layers(graph, 1, 1) == {'b', 'c'}
+    assert in_layers(graph, 1, 2) == {'b', 'c', 'd'}
+    assert in_layers(graph, 2) == {'d', 'e'}
+    assert in_layers(graph, 0) == set(diamond_dependencies.keys())
+    assert in_layers(graph, 4) == set()
@@ -0,0 +1,58 @@
+# Copyright 2026 Dirk Thomas
+# Licensed under the Apache License, Version 2.0
+
+import gc
+import tracemalloc
+
+from colcon_core.event import test as event_test
+from colcon_core.event.job import JobEnded
+from colcon_core.event.job import JobStarted
+from colcon_core.event.output import StdoutLine
+from colcon_package_selection.package_selection.previous.event_handler \
+    import StoreResultEventHandler
+import pytest
+
+EVENT_COUNT = 100000
+EVENTS_PER_JOB = 100
+# the size of the data referenced by each job
+JOB_PAYLOAD_SIZE = 64 * 1024
+# the maximum memory retained after replaying all events
+MEMORY_BUDGET = 1024 * 1024
+
+
+def generate_events(create_job, build_base):
+    for i in range(EVENT_COUNT // EVENTS_PER_JOB):
+        name = f'pkg_{i}'
+        # simulate the memory held by the task context of a real job
+        job = create_job(
+            name, build_base, 'test', payload=bytearray(JOB_PAYLOAD_SIZE))
+        yield JobStarted(name), job
+        for j in range(EVENTS_PER_JOB - 2):
+            if j % 2:
+                yield event_test.TestFailure(name), job
+            else:
+                yield StdoutLine(f'line {j}\n'), job
+        yield JobEnded(name, 0), job
+
+
+@pytest.mark.benchmark
+def test_event_handler_memory(create_job, tmp_path):
+    extension = StoreResultEventHandler()
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        for event in generate_events(create_job, tmp_path):
+            extension(event)
+        gc.collect()
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert not extension._test_failures
+    assert not extension._start_times
+    retained = after - before
+    assert retained <= MEMORY_BUDGET, \
+        f'Replaying {EVENT_COUNT} events retained {retained} bytes which ' \
+        f'exceeds the budget of {MEMORY_BUDGET} bytes'
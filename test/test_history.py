@@ -0,0 +1,177 @@
+# Copyright 2026 Dirk Thomas
+# Licensed under the Apache License, Version 2.0
+
+import os
+
+from colcon_package_selection.package_selection.previous \
+    import add_history_entry
+from colcon_package_selection.package_selection.previous \
+    import get_estimated_durations
+from colcon_package_selection.package_selection.previous \
+    import get_previous_histories
+from colcon_package_selection.package_selection.previous \
+    import HISTORY_FILENAME
+from colcon_package_selection.package_selection.previous \
+    import HISTORY_SIZE
+from colcon_package_selection.package_selection.previous \
+    import HistoryEntry
+from colcon_package_selection.package_selection.previous \
+    import OUTCOME_ABORTED
+from colcon_package_selection.package_selection.previous \
+    import OUTCOME_FAILURE
+from colcon_package_selection.package_selection.previous \
+    import OUTCOME_SUCCESS
+from colcon_package_selection.package_selection.previous \
+    import OUTCOME_TEST_FAILURE
+from colcon_package_selection.package_selection.previous.fail_fast \
+    import FailFastOrderPackageSelectionExtension
+from colcon_package_selection.package_selection.previous.package_selection \
+    import PreviousPackageSelectionExtension
+
+# a -> b, c and d without any dependencies
+DEPENDENCIES = {
+    'a': [],
+    'b': ['a'],
+    'c': [],
+    'd': [],
+}
+
+
+def add_test_history(build_base, histories):
+    for name, entries in histories.items():
+        for i, (duration, outcome) in enumerate(entries):
+            add_history_entry(
+                os.path.join(str(build_base), name), 'test',
+                HistoryEntry(float(i), duration, outcome))
+
+
+def test_history_size(tmp_path):
+    for i in range(HISTORY_SIZE + 5):
+        add_history_entry(
+            str(tmp_path / 'a'), 'test',
+            HistoryEntry(float(i), 1.0, OUTCOME_SUCCESS))
+    for i in range(5):
+        add_history_entry(
+            str(tmp_path / 'b'), 'test',
+            HistoryEntry(float(i), 1.0, OUTCOME_SUCCESS), size=3)
+
+    histories = get_previous_histories(
+        str(tmp_path), ['a', 'b', 'c'], 'test')
+    # only the newest entries are kept
+    assert [e.timestamp for e in histories['a']] == \
+        [float(i) for i in range(5, HISTORY_SIZE + 5)]
+    assert [e.timestamp for e in histories['b']] == [2.0, 3.0, 4.0]
+    assert histories['c'] == []
+    # the history is specific to the verb
+    assert get_previous_histories(str(tmp_path), ['a'], 'build') == \
+        {'a': []}
+
+
+def test_partial_record(tmp_path):
+    add_history_entry(
+        str(tmp_path / 'a'), 'test',
+        HistoryEntry(1.0, 2.0, OUTCOME_FAILURE))
+    path = tmp_path / 'a' / HISTORY_FILENAME.format(verb_name='test')
+    data = path.read_bytes()
+    # simulate an interrupted write of the second record
+    path.write_bytes(data + data[:len(data) // 2])
+
+    assert get_previous_histories(str(tmp_path), ['a'], 'test') == \
+        {'a': [HistoryEntry(1.0, 2.0, OUTCOME_FAILURE)]}
+
+    # the partial record is dropped when appending
+    add_history_entry(
+        str(tmp_path / 'a'), 'test',
+        HistoryEntry(3.0, 4.0, OUTCOME_SUCCESS))
+    assert get_previous_histories(str(tmp_path), ['a'], 'test') == {'a': [
+        HistoryEntry(1.0, 2.0, OUTCOME_FAILURE),
+        HistoryEntry(3.0, 4.0, OUTCOME_SUCCESS)]}
+    assert len(path.read_bytes()) == 2 * len(data)
+
+
+def test_estimated_durations():
+    histories = {
+        'a': [
+            HistoryEntry(0.0, 1.0, OUTCOME_SUCCESS),
+            HistoryEntry(1.0, 3.0, OUTCOME_FAILURE),
+            HistoryEntry(2.0, 100.0, OUTCOME_ABORTED)],
+        'b': [HistoryEntry(0.0, 4.0, OUTCOME_SUCCESS)],
+        'c': [HistoryEntry(0.0, 6.0, OUTCOME_SUCCESS)],
+        # unknown durations
+        'd': [HistoryEntry(0.0, 0.0, OUTCOME_SUCCESS)],
+        'e': [],
+    }
+    # aborted entries are ignored and the median is used as the default
+    assert get_estimated_durations(histories, default_duration=60.0) == \
+        {'a': 2.0, 'b': 4.0, 'c': 6.0, 'd': 4.0, 'e': 4.0}
+    assert get_estimated_durations({'a': []}, default_duration=60.0) == \
+        {'a': 60.0}
+
+
+def test_select_flaky(create_decorators, parse_args, tmp_path):
+    add_test_history(tmp_path, {
+        # passed and failed tests
+        'a': [(1.0, OUTCOME_SUCCESS), (1.0, OUTCOME_TEST_FAILURE)],
+        # passed tests and an aborted run
+        'b': [(1.0, OUTCOME_SUCCESS), (1.0, OUTCOME_ABORTED)],
+        # always failing
+        'c': [(1.0, OUTCOME_FAILURE), (1.0, OUTCOME_TEST_FAILURE)],
+        # d has never been tested
+    })
+
+    extension = PreviousPackageSelectionExtension()
+    args = parse_args(
+        extension, ['--packages-select-test-flaky'],
+        build_base=str(tmp_path))
+    decorators = create_decorators(DEPENDENCIES)
+    extension.select_packages(args, decorators)
+    assert [d.descriptor.name for d in decorators if d.selected] == ['a']
+
+
+def fail_fast_order(create_decorators, parse_args, build_base):
+    extension = FailFastOrderPackageSelectionExtension()
+    args = parse_args(
+        extension, ['--packages-test-fail-fast-order'],
+        build_base=str(build_base))
+    decorators = create_decorators(DEPENDENCIES)
+    extension.select_packages(args, decorators)
+    return [d.descriptor.name for d in decorators]
+
+
+def test_fail_fast_order(create_decorators, parse_args, tmp_path):
+    add_test_history(tmp_path, {
+        # a failure probability of 1/12 per second
+        'a': [(1.0, OUTCOME_SUCCESS)] * 10,
+        # a failure probability of 11/12 per second
+        'b': [(1.0, OUTCOME_TEST_FAILURE)] * 10,
+        # a failure probability of 11/12 per 100 seconds
+        'c': [(100.0, OUTCOME_TEST_FAILURE)] * 10,
+        # a failure probability of 6/12 per second
+        'd': [(1.0, OUTCOME_SUCCESS), (1.0, OUTCOME_FAILURE)] * 5,
+    })
+    # b is the most likely to fail but must be ordered after a, c is likely
+    # to fail but takes too long
+    assert fail_fast_order(create_decorators, parse_args, tmp_path) == \
+        ['d', 'a', 'b', 'c']
+
+
+def test_fail_fast_order_unknown(create_decorators, parse_args, tmp_path):
+    add_test_history(tmp_path, {
+        'a': [(1.0, OUTCOME_SUCCESS)] * 10,
+        'c': [(1.0, OUTCOME_SUCCESS)] * 20,
+        # aborted runs are ignored
+        'd': [(1.0, OUTCOME_ABORTED)] * 10,
+    })
+    # packages without a history are assumed to fail with a probability of
+    # 1/2 and to take the median duration
+    assert fail_fast_order(create_decorators, parse_args, tmp_path) == \
+        ['d', 'a', 'b', 'c']
+
+
+def test_fail_fast_order_without_build_base(create_decorators, parse_args):
+    extension = FailFastOrderPackageSelectionExtension()
+    args = parse_args(extension, ['--packages-test-fail-fast-order'])
+    decorators = create_decorators(DEPENDENCIES)
+    order = [d.descriptor.name for d in decorators]
+    extension.select_packages(args, decorators)
+    assert [d.descriptor.name for d in decorators] == order
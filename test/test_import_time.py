@@ -0,0 +1,96 @@
+# Copyright 2026 Dirk Thomas
+# Licensed under the Apache License, Version 2.0
+
+import configparser
+import os
+from pathlib import Path
+import subprocess
+import sys
+
+import pytest
+
+# the modules which are imported by colcon itself before loading extensions
+PRELOADED_MODULES = (
+    'colcon_core.command',
+    'colcon_core.event_handler',
+    'colcon_core.package_augmentation',
+    'colcon_core.package_discovery',
+    'colcon_core.package_selection',
+)
+
+# modules which must not be imported by loading the extensions
+DEFERRED_MODULES = (
+    'asyncio',
+    'colcon_core.subprocess',
+    'colcon_core.verb.build',
+    'colcon_core.verb.test',
+    'hashlib',
+    'mmap',
+    'tempfile',
+)
+
+# the maximum cumulative import time of the extensions in microseconds,
+# about twice the slowest measured time of ~9ms
+IMPORT_TIME_BUDGET = 20000
+
+# the timing depends on the machine and is therefore only checked on request
+IMPORT_TIME_ENVIRONMENT_VARIABLE = 'COLCON_TEST_IMPORT_TIME'
+
+
+def get_entry_point_modules():
+    config = configparser.ConfigParser()
+    config.read(str(Path(__file__).parents[1] / 'setup.cfg'))
+    modules = set()
+    for line in config['options.entry_points'].values():
+        for entry_point in line.strip().splitlines():
+            value = entry_point.split('=', 1)[1].strip()
+            modules.add(value.split(':', 1)[0])
+    return sorted(modules)
+
+
+def import_extensions(*, statements=()):
+    code = '; '.join(
+        ['import ' + m for m in PRELOADED_MODULES] +
+        [
+            'import sys', 'preloaded = set(sys.modules)',
+            "sys.stderr.write('---\\n')"] +
+        ['import ' + m for m in get_entry_point_modules()] +
+        list(statements))
+    return subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True,
+        universal_newlines=True)
+
+
+@pytest.mark.benchmark
+def test_deferred_imports():
+    result = import_extensions(statements=[
+        'print(",".join(sorted('
+        'set({modules!r}) & (set(sys.modules) - preloaded))))'
+        .format(modules=DEFERRED_MODULES)])
+    imported = result.stdout.strip()
+    assert not imported, \
+        'Loading the extensions imported the modules: ' + imported
+
+
+@pytest.mark.benchmark
+@pytest.mark.skipif(
+    not os.environ.get(IMPORT_TIME_ENVIRONMENT_VARIABLE),
+    reason=f'set {IMPORT_TIME_ENVIRONMENT_VARIABLE} to check the import time')
+def test_import_time():
+    # use the best of multiple runs to reduce the noise
+    totals = []
+    for _ in range(3):
+        result = import_extensions()
+        lines = result.stderr.split('---\n', 1)[1].splitlines()
+        total = 0
+        for line in lines:
+            if not line.startswith('import time:'):
+                continue
+            self_time = line.split(':', 1)[1].split('|')[0].strip()
+            if self_time.isdigit():
+                total += int(self_time)
+        totals.append(total)
+    assert min(totals) <= IMPORT_TIME_BUDGET, \
+        f'Importing the extensions took {min(totals)}us which exceeds ' \
+        f'the budget of {IMPORT_TIME_BUDGET}us'
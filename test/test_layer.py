@@ -0,0 +1,58 @@
+# Copyright 2026 Dirk Thomas
+# Licensed under the Apache License, Version 2.0
+
+from colcon_package_selection.package_selection.layer \
+    import LayerPackageSelection
+import pytest
+
+
+@pytest.fixture
+def select(create_decorators, diamond_dependencies, parse_args):
+    def select(argv):
+        extension = LayerPackageSelection()
+        args = parse_args(extension, argv)
+        decorators = create_decorators(diamond_dependencies)
+        extension.select_packages(args, decorators)
+        return {d.descriptor.name for d in decorators if d.selected}
+    return select
+
+
+@pytest.mark.parametrize('value,layers', [
+    ('1', (1, 1)),
+    ('1:', (1, None)),
+    (':2', (0, 2)),
+    ('1:2', (1, 2)),
+    ('2:2', (2, 2)),
+])
+def test_layer_range(parse_args, value, layers):
+    args = parse_args(LayerPackageSelection(), ['--packages-layer', value])
+    assert args.packages_layer == layers
+
+
+@pytest.mark.parametrize('value', ['2:1', '-1', '0:-1', 'one', '1:two'])
+def test_invalid_layer_range(parse_args, value):
+    with pytest.raises(SystemExit):
+        parse_args(LayerPackageSelection(), ['--packages-layer', value])
+
+
+def test_select_layers(select, diamond_dependencies):
+    assert select([]) == set(diamond_dependencies.keys())
+    assert select(['--packages-layer', '1']) == {'b', 'c'}
+    assert select(['--packages-layer', '2:']) == {'d', 'e'}
+    assert select(['--packages-layer', ':1']) == {'a', 'b', 'c'}
+    assert select(['--packages-layer', '1:2']) == {'b', 'c', 'd'}
+
+
+def test_dump_layers(select, tmp_path, capsys):
+    path = tmp_path / 'layers.txt'
+    # the dump contains all packages independent of the selected layers
+    assert select([
+        '--packages-layer', '3', '--packages-layer-dump', str(path)]) == \
+        {'e'}
+    lines = path.read_text().splitlines()
+    assert lines[0] == '0 a'
+    assert sorted(lines[1:3]) == ['1 b', '1 c']
+    assert lines[3:] == ['2 d', '3 e']
+
+    select(['--packages-layer-dump', '-'])
+    assert capsys.readouterr().out.splitlines() == lines
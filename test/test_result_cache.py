@@ -0,0 +1,205 @@
+# Copyright 2026 Dirk Thomas
+# Licensed under the Apache License, Version 2.0
+
+import os
+
+from colcon_core.event.job import JobEnded
+from colcon_core.event.job import JobStarted
+from colcon_core.event_reactor import EventReactorShutdown
+from colcon_package_selection.package_selection.previous import result_cache
+from colcon_package_selection.package_selection.previous.cache_key \
+    import CacheKeyPackageSelectionExtension
+from colcon_package_selection.package_selection.previous.event_handler \
+    import StoreResultEventHandler
+from colcon_package_selection.package_selection.previous.package_selection \
+    import PreviousPackageSelectionExtension
+from colcon_package_selection.package_selection.previous.result_cache \
+    import evict_results
+from colcon_package_selection.package_selection.previous.result_cache \
+    import get_package_key
+from colcon_package_selection.package_selection.previous.result_cache \
+    import get_package_keys
+from colcon_package_selection.package_selection.previous.result_cache \
+    import has_cached_result
+from colcon_package_selection.package_selection.previous.result_cache \
+    import publish_result
+
+# a -> b -> c, d without any dependencies
+DEPENDENCIES = {
+    'a': [],
+    'b': ['a'],
+    'c': ['b'],
+    'd': [],
+}
+
+
+def create_workspace(tmp_path):
+    src = tmp_path / 'src'
+    for name in DEPENDENCIES.keys():
+        (src / name).mkdir(parents=True)
+        (src / name / 'setup.py').write_text(name)
+    return src
+
+
+def test_publish_result(tmp_path):
+    cache_path = tmp_path / 'cache'
+    key = 'ab' + '0' * 62
+    assert not has_cached_result(cache_path, key)
+
+    publish_result(cache_path, key, 'pkg\n')
+    entry = cache_path / 'ab' / key
+    assert entry.read_text() == 'pkg\n'
+    # the temporary file has been renamed
+    assert os.listdir(str(cache_path / 'ab')) == [key]
+    assert has_cached_result(cache_path, key)
+
+    # publishing again replaces the entry
+    publish_result(cache_path, key, 'other\n')
+    assert entry.read_text() == 'other\n'
+    assert os.listdir(str(cache_path / 'ab')) == [key]
+
+
+def test_evict_results(tmp_path):
+    cache_path = tmp_path / 'cache'
+    keys = ['{i:02d}'.format_map(locals()) + '0' * 62 for i in range(5)]
+    for i, key in enumerate(keys):
+        publish_result(cache_path, key)
+        entry = cache_path / key[:2] / key
+        os.utime(str(entry), (1000 + i, 1000 + i))
+
+    # a hit refreshes the oldest entry
+    assert has_cached_result(cache_path, keys[0])
+
+    evict_results(cache_path, 3)
+    assert [has_cached_result(cache_path, k) for k in keys] == \
+        [True, False, False, True, True]
+
+    # nothing to evict
+    evict_results(cache_path, 3)
+    evict_results(tmp_path / 'missing', 3)
+
+
+def test_get_package_keys(create_decorators, tmp_path):
+    src = create_workspace(tmp_path)
+    keys = get_package_keys(create_decorators(DEPENDENCIES, root=src))
+    assert set(keys.keys()) == set(DEPENDENCIES.keys())
+    assert len(set(keys.values())) == len(keys)
+
+    # generated and hidden files and directories are ignored
+    (src / 'a' / '.hidden').write_text('hidden')
+    (src / 'a' / '.git').mkdir()
+    (src / 'a' / '.git' / 'HEAD').write_text('head')
+    (src / 'a' / '__pycache__').mkdir()
+    (src / 'a' / '__pycache__' / 'setup.pyc').write_text('compiled')
+    (src / 'a' / 'a.egg-info').mkdir()
+    (src / 'a' / 'a.egg-info' / 'PKG-INFO').write_text('info')
+    assert get_package_keys(create_decorators(DEPENDENCIES, root=src)) == \
+        keys
+
+    # a change of the sources of a dependency changes the recursive keys
+    (src / 'b' / 'setup.py').write_text('changed')
+    changed_keys = get_package_keys(
+        create_decorators(DEPENDENCIES, root=src))
+    assert changed_keys['a'] == keys['a']
+    assert changed_keys['b'] != keys['b']
+    assert changed_keys['c'] != keys['c']
+    assert changed_keys['d'] == keys['d']
+
+
+def test_get_package_keys_subset(create_decorators, tmp_path, monkeypatch):
+    src = create_workspace(tmp_path)
+    all_keys = get_package_keys(create_decorators(DEPENDENCIES, root=src))
+
+    fingerprinted = []
+    get_source_fingerprint = result_cache.get_source_fingerprint
+
+    def fingerprint(path):
+        fingerprinted.append(os.path.basename(str(path)))
+        return get_source_fingerprint(path)
+
+    monkeypatch.setattr(result_cache, 'get_source_fingerprint', fingerprint)
+
+    # only the packages and their recursive dependencies are computed
+    decorators = create_decorators(DEPENDENCIES, root=src)
+    keys = get_package_keys(decorators, ['b'])
+    assert keys == {'a': all_keys['a'], 'b': all_keys['b']}
+    assert sorted(fingerprinted) == ['a', 'b']
+
+    # no keys are kept between calls
+    del fingerprinted[:]
+    keys = get_package_keys(decorators, ['c'])
+    assert keys == {name: all_keys[name] for name in ('a', 'b', 'c')}
+    assert sorted(fingerprinted) == ['a', 'b', 'c']
+
+
+def build(create_decorators, create_job, parse_args, src, build_base, rcs):
+    # record the keys of the selected packages
+    extension = CacheKeyPackageSelectionExtension()
+    args = parse_args(
+        extension, [], build_base=str(build_base), verb_name='build')
+    extension.select_packages(
+        args, create_decorators(DEPENDENCIES, root=src))
+
+    event_handler = StoreResultEventHandler()
+    for name, rc in rcs.items():
+        job = create_job(name, build_base, 'build')
+        event_handler((JobStarted(name), job))
+        event_handler((JobEnded(name, rc), job))
+    event_handler((EventReactorShutdown(), None))
+
+
+def skip_cached(create_decorators, parse_args, src, build_base):
+    extension = PreviousPackageSelectionExtension()
+    args = parse_args(
+        extension, ['--packages-skip-build-cached'],
+        build_base=str(build_base), verb_name='build')
+    decorators = create_decorators(DEPENDENCIES, root=src)
+    extension.select_packages(args, decorators)
+    return {d.descriptor.name for d in decorators if d.selected}
+
+
+def get_cache_entries(cache_path):
+    return sorted(
+        p.name for p in cache_path.glob('*/*') if not p.name.startswith('.'))
+
+
+def test_skip_build_cached(
+    create_decorators, create_job, parse_args, tmp_path, monkeypatch,
+):
+    src = create_workspace(tmp_path)
+    build_base = tmp_path / 'build'
+    cache_path = tmp_path / 'cache'
+    monkeypatch.setenv('COLCON_RESULT_CACHE', str(cache_path))
+
+    # only successful builds are published
+    build(
+        create_decorators, create_job, parse_args, src, build_base,
+        {'a': 0, 'b': 0, 'c': 0, 'd': 1})
+    keys = {
+        name: get_package_key(str(build_base / name), 'build')
+        for name in DEPENDENCIES.keys()}
+    assert all(keys.values())
+    assert get_cache_entries(cache_path) == sorted(
+        keys[name] for name in ('a', 'b', 'c'))
+
+    # unchanged packages are skipped
+    assert skip_cached(create_decorators, parse_args, src, build_base) == \
+        {'d'}
+
+    # a change of the sources affects the package and its dependents
+    (src / 'b' / 'setup.py').write_text('changed')
+    assert skip_cached(create_decorators, parse_args, src, build_base) == \
+        {'b', 'c', 'd'}
+
+    # the least recently used entries are evicted at the end
+    for entry in cache_path.glob('*/*'):
+        os.utime(str(entry), (1000, 1000))
+    monkeypatch.setenv('COLCON_RESULT_CACHE_SIZE', '2')
+    build(
+        create_decorators, create_job, parse_args, src, build_base,
+        {'b': 0, 'c': 0})
+    assert get_cache_entries(cache_path) == sorted(
+        get_package_key(str(build_base / name), 'build')
+        for name in ('b', 'c'))
+    assert skip_cached(create_decorators, parse_args, src, build_base) == \
+        {'a', 'd'}
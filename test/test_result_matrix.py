@@ -0,0 +1,142 @@
+# Copyright 2026 Dirk Thomas
+# Licensed under the Apache License, Version 2.0
+
+import os
+
+from colcon_core.event.job import JobEnded
+from colcon_core.event.job import JobStarted
+from colcon_core.event_reactor import EventReactorShutdown
+from colcon_package_selection.package_selection.previous \
+    import add_matrix_result
+from colcon_package_selection.package_selection.previous \
+    import compact_result_matrix
+from colcon_package_selection.package_selection.previous \
+    import get_result_matrix
+from colcon_package_selection.package_selection.previous \
+    import RESULT_MATRIX_FILENAME
+from colcon_package_selection.package_selection.previous.event_handler \
+    import StoreResultEventHandler
+from colcon_package_selection.package_selection.previous.package_selection \
+    import PreviousPackageSelectionExtension
+
+# a -> b, c and d without any dependencies
+DEPENDENCIES = {
+    'a': [],
+    'b': ['a'],
+    'c': [],
+    'd': [],
+}
+
+
+def run_jobs(create_job, extension, build_base, verb_name, results):
+    for name, rc in results:
+        job = create_job(name, build_base, verb_name)
+        extension((JobStarted(name), job))
+        extension((JobEnded(name, rc), job))
+
+
+def select(create_decorators, parse_args, build_base, argv):
+    extension = PreviousPackageSelectionExtension()
+    args = parse_args(extension, argv, build_base=str(build_base))
+    decorators = create_decorators(DEPENDENCIES)
+    extension.select_packages(args, decorators)
+    return {d.descriptor.name for d in decorators if d.selected}
+
+
+def test_add_and_compact(tmp_path):
+    path = tmp_path / RESULT_MATRIX_FILENAME
+    assert get_result_matrix(str(tmp_path)) == {}
+    # nothing to compact
+    compact_result_matrix(str(tmp_path))
+    assert not path.exists()
+
+    add_matrix_result(str(tmp_path), 'build', 'a', '1')
+    add_matrix_result(str(tmp_path), 'lint', 'a', '0')
+    add_matrix_result(str(tmp_path), 'build', 'b', '0')
+    assert len(path.read_text().splitlines()) == 3
+
+    # a matrix without superseded results isn't being rewritten
+    os.utime(str(path), ns=(0, 0))
+    compact_result_matrix(str(tmp_path))
+    assert path.stat().st_mtime_ns == 0
+
+    # results are appended and the newest result wins
+    add_matrix_result(str(tmp_path), 'build', 'a', '0')
+    assert len(path.read_text().splitlines()) == 4
+    matrix = {
+        'build': {'a': '0', 'b': '0'},
+        'lint': {'a': '0'},
+    }
+    assert get_result_matrix(str(tmp_path)) == matrix
+
+    compact_result_matrix(str(tmp_path))
+    assert len(path.read_text().splitlines()) == 3
+    assert get_result_matrix(str(tmp_path)) == matrix
+    assert os.listdir(str(tmp_path)) == [RESULT_MATRIX_FILENAME]
+
+
+def test_partial_lines(tmp_path):
+    path = tmp_path / RESULT_MATRIX_FILENAME
+    path.write_text(
+        'build\ta\t0\n'
+        'build\tb\t\n'
+        '\tc\t0\n'
+        'build\td\t1\textra\n'
+        'build\te')
+    assert get_result_matrix(str(tmp_path)) == {'build': {'a': '0'}}
+
+    # the compaction drops the partial lines
+    compact_result_matrix(str(tmp_path))
+    assert path.read_text() == 'build\ta\t0\n'
+
+
+def test_event_handler(create_decorators, create_job, parse_args, tmp_path):
+    extension = StoreResultEventHandler()
+    path = tmp_path / RESULT_MATRIX_FILENAME
+
+    # a custom verb, d has never been processed
+    run_jobs(create_job, extension, tmp_path, 'lint', [
+        ('a', 0), ('b', 1), ('c', 'SIGINT')])
+    # a superseded result
+    run_jobs(create_job, extension, tmp_path, 'lint', [('a', 2)])
+    run_jobs(create_job, extension, tmp_path, 'build', [('a', 0), ('b', 0)])
+    assert len(path.read_text().splitlines()) == 6
+
+    # the matrix is compacted at the end
+    extension((EventReactorShutdown(), None))
+    assert len(path.read_text().splitlines()) == 5
+    assert get_result_matrix(str(tmp_path)) == {
+        'build': {'a': '0', 'b': '0'},
+        'lint': {'a': '2', 'b': '1', 'c': 'SIGINT'},
+    }
+
+    # aborted packages are not considered errors
+    assert select(
+        create_decorators, parse_args, tmp_path,
+        ['--packages-select-failed', 'lint']) == {'a', 'b'}
+    assert select(
+        create_decorators, parse_args, tmp_path,
+        ['--packages-select-failed', 'build']) == set()
+    assert select(
+        create_decorators, parse_args, tmp_path,
+        ['--packages-select-failed', 'unknown']) == set()
+
+    assert select(
+        create_decorators, parse_args, tmp_path,
+        ['--packages-skip-succeeded', 'lint']) == {'a', 'b', 'c', 'd'}
+    assert select(
+        create_decorators, parse_args, tmp_path,
+        ['--packages-skip-succeeded', 'build']) == {'c', 'd'}
+
+    # both arguments can be combined
+    assert select(
+        create_decorators, parse_args, tmp_path, [
+            '--packages-select-failed', 'lint',
+            '--packages-skip-succeeded', 'build']) == set()
+
+
+def test_append_after_partial_line(tmp_path):
+    path = tmp_path / RESULT_MATRIX_FILENAME
+    path.write_text('build\ta\t0\nbuild\tb')
+    add_matrix_result(str(tmp_path), 'build', 'c', '1')
+    assert get_result_matrix(str(tmp_path)) == {'build': {'a': '0', 'c': '1'}}
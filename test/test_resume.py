@@ -0,0 +1,72 @@
+# Copyright 2026 Dirk Thomas
+# Licensed under the Apache License, Version 2.0
+
+import os
+
+from colcon_package_selection.package_selection.previous import set_result
+from colcon_package_selection.package_selection.previous.package_selection \
+    import PreviousPackageSelectionExtension
+
+# a -> b -> c, d -> e, f -> g, h without any dependencies
+DEPENDENCIES = {
+    'a': [],
+    'b': ['a'],
+    'c': ['b'],
+    'd': [],
+    'e': ['d'],
+    'f': [],
+    'g': ['f'],
+    'h': [],
+}
+
+# a has failed, d was aborted, c and f have succeeded, the others have never
+# been built
+RESULTS = {
+    'a': '1',
+    'c': '0',
+    'd': 'SIGINT',
+    'f': '0',
+}
+
+
+def resume(create_decorators, parse_args, build_base, *, selected=None):
+    for name, result in RESULTS.items():
+        set_result(os.path.join(str(build_base), name), 'build', result)
+
+    extension = PreviousPackageSelectionExtension()
+    args = parse_args(
+        extension, ['--packages-resume'], build_base=str(build_base))
+    decorators = create_decorators(DEPENDENCIES)
+    if selected is not None:
+        for decorator in decorators:
+            decorator.selected = decorator.descriptor.name in selected
+    extension.select_packages(args, decorators)
+    return {d.descriptor.name for d in decorators if d.selected}
+
+
+def test_resume(create_decorators, parse_args, tmp_path):
+    # the failed and aborted packages as well as their never built recursive
+    # dependents, but neither the succeeded dependent c nor the never built
+    # packages g and h which don't depend on an unfinished package
+    assert resume(create_decorators, parse_args, tmp_path) == \
+        {'a', 'b', 'd', 'e'}
+
+
+def test_resume_ruled_out(create_decorators, parse_args, tmp_path):
+    # the dependents of a failed package which has been ruled out by another
+    # extension are still being selected
+    assert resume(
+        create_decorators, parse_args, tmp_path,
+        selected={'b', 'c', 'e', 'g', 'h'}
+    ) == {'b', 'e'}
+
+
+def test_resume_without_previous_results(
+    create_decorators, parse_args, tmp_path,
+):
+    extension = PreviousPackageSelectionExtension()
+    args = parse_args(
+        extension, ['--packages-resume'], build_base=str(tmp_path / 'build'))
+    decorators = create_decorators(DEPENDENCIES)
+    extension.select_packages(args, decorators)
+    assert not [d for d in decorators if d.selected]
@@ -0,0 +1,71 @@
+# Copyright 2026 Dirk Thomas
+# Licensed under the Apache License, Version 2.0
+
+from colcon_package_selection.package_selection.select_skip \
+    import SelectSkipPackageSelectionExtension
+import pytest
+
+
+@pytest.fixture
+def select(create_decorators, example_dependencies, parse_args):
+    def select(argv, *, deselected=()):
+        extension = SelectSkipPackageSelectionExtension()
+        args = parse_args(extension, argv)
+        decorators = create_decorators(example_dependencies)
+        for decorator in decorators:
+            if decorator.descriptor.name in deselected:
+                decorator.selected = False
+        extension.check_parameters(args, set(example_dependencies.keys()))
+        extension.select_packages(args, decorators)
+        return {d.descriptor.name for d in decorators if d.selected}
+    return select
+
+
+def test_no_arguments(select, example_dependencies):
+    assert select([]) == set(example_dependencies.keys())
+
+
+def test_select(select):
+    # the dependencies aren't considered
+    assert select(['--packages-select', 'c', 'z']) == {'c', 'z'}
+    assert select(['--packages-select', 'c', 'z'], deselected={'z'}) == \
+        {'c'}
+    # an empty list selects no packages
+    assert select(['--packages-select']) == set()
+    # unknown packages are ignored
+    assert select(['--packages-select', 'a', 'unknown']) == {'a'}
+
+
+def test_skip(select):
+    assert select(['--packages-skip', 'a', 'f']) == {'b', 'c', 'd', 'e', 'z'}
+    assert select(['--packages-skip', 'a'], deselected={'z'}) == \
+        {'b', 'c', 'd', 'e', 'f'}
+
+
+def test_select_regex(select):
+    assert select(['--packages-select-regex', '[a-c]']) == {'a', 'b', 'c'}
+    # the pattern must match at the beginning of the name
+    assert select(['--packages-select-regex', '.b', 'z']) == {'z'}
+    # the names and the patterns are combined
+    assert select([
+        '--packages-select', 'f', '--packages-select-regex', 'z',
+    ]) == {'f', 'z'}
+    assert select(['--packages-select-regex', '[a-c]'], deselected={'b'}) == \
+        {'a', 'c'}
+
+
+def test_skip_regex(select):
+    assert select(['--packages-skip-regex', '[a-e]']) == {'f', 'z'}
+    assert select([
+        '--packages-skip', 'f', '--packages-skip-regex', '[a-e]',
+    ]) == {'z'}
+
+
+def test_select_and_skip(select):
+    # skipping takes precedence over selecting
+    assert select([
+        '--packages-select', 'a', 'b', '--packages-skip', 'b',
+    ]) == {'a'}
+    assert select([
+        '--packages-select-regex', '[a-c]', '--packages-skip-regex', 'c',
+    ]) == {'a', 'b'}
@@ -0,0 +1,109 @@
+# Copyright 2026 Dirk Thomas
+# Licensed under the Apache License, Version 2.0
+
+import os
+
+from colcon_package_selection.package_selection.previous \
+    import get_previous_timestamps
+from colcon_package_selection.package_selection.previous import set_result
+from colcon_package_selection.package_selection.previous.package_selection \
+    import PreviousPackageSelectionExtension
+
+# a -> b -> c, d without any dependencies
+DEPENDENCIES = {
+    'a': [],
+    'b': ['a'],
+    'c': ['b'],
+    'd': [],
+}
+
+
+def skip_up_to_date(
+    create_decorators, parse_args, build_base, results, *, selected=None,
+):
+    for name, (result, timestamp) in results.items():
+        set_result(
+            os.path.join(str(build_base), name), 'build', result,
+            timestamp=timestamp)
+
+    extension = PreviousPackageSelectionExtension()
+    args = parse_args(
+        extension, ['--packages-skip-build-up-to-date'],
+        build_base=str(build_base))
+    decorators = create_decorators(DEPENDENCIES)
+    if selected is not None:
+        for decorator in decorators:
+            decorator.selected = decorator.descriptor.name in selected
+    extension.select_packages(args, decorators)
+    return {d.descriptor.name for d in decorators if d.selected}
+
+
+def test_all_up_to_date(create_decorators, parse_args, tmp_path):
+    assert skip_up_to_date(create_decorators, parse_args, tmp_path, {
+        'a': ('0', 1.0), 'b': ('0', 2.0), 'c': ('0', 3.0), 'd': ('0', 1.0),
+    }) == set()
+
+
+def test_dependency_rebuilt_after_dependent(
+    create_decorators, parse_args, tmp_path,
+):
+    # a has been rebuilt after b which therefore needs to be rebuilt as well
+    # as c which depends on b
+    assert skip_up_to_date(create_decorators, parse_args, tmp_path, {
+        'a': ('0', 5.0), 'b': ('0', 2.0), 'c': ('0', 6.0), 'd': ('0', 1.0),
+    }) == {'b', 'c'}
+
+
+def test_failed_dependency(create_decorators, parse_args, tmp_path):
+    # a has failed to build and will be rebuilt therefore its recursive
+    # dependents are being rebuilt even though they are newer
+    assert skip_up_to_date(create_decorators, parse_args, tmp_path, {
+        'a': ('1', 1.0), 'b': ('0', 2.0), 'c': ('0', 3.0), 'd': ('0', 1.0),
+    }) == {'a', 'b', 'c'}
+
+
+def test_selected_dependency(create_decorators, parse_args, tmp_path):
+    # b is selected since it is older than a, c needs to be rebuilt after b
+    # even though c is newer than both
+    assert skip_up_to_date(create_decorators, parse_args, tmp_path, {
+        'a': ('0', 3.0), 'b': ('0', 2.0), 'c': ('0', 4.0), 'd': ('0', 1.0),
+    }) == {'b', 'c'}
+
+
+def test_unselected_dependency(create_decorators, parse_args, tmp_path):
+    # a package which has been ruled out by another extension only forces a
+    # rebuild downstream if it has no successful result
+    results = {
+        'a': ('0', 1.0), 'b': ('0', 2.0), 'c': ('0', 3.0), 'd': ('0', 1.0)}
+    assert skip_up_to_date(
+        create_decorators, parse_args, tmp_path, results,
+        selected={'b', 'c', 'd'}) == set()
+
+    results['a'] = ('1', 1.0)
+    assert skip_up_to_date(
+        create_decorators, parse_args, tmp_path, results,
+        selected={'b', 'c', 'd'}) == {'b', 'c'}
+
+
+def test_missing_timestamp(create_decorators, parse_args, tmp_path):
+    # b has a successful result but no timestamp, d has never been built
+    assert skip_up_to_date(create_decorators, parse_args, tmp_path, {
+        'a': ('0', 1.0), 'b': ('0', None), 'c': ('0', 3.0),
+    }) == {'b', 'c', 'd'}
+
+
+def test_timestamp_round_trip(tmp_path):
+    set_result(str(tmp_path / 'a'), 'build', 0, timestamp=1234.5)
+    set_result(str(tmp_path / 'b'), 'build', 0, timestamp=1)
+    set_result(str(tmp_path / 'c'), 'build', 0)
+    (tmp_path / 'd').mkdir()
+    (tmp_path / 'd' / 'colcon_build.stamp').write_text('invalid\n')
+
+    assert get_previous_timestamps(
+        str(tmp_path), ['a', 'b', 'c', 'd', 'e'], 'build'
+    ) == {'a': 1234.5, 'b': 1.0, 'c': None, 'd': None, 'e': None}
+    # the timestamps are specific to the verb
+    assert get_previous_timestamps(str(tmp_path), ['a'], 'test') == \
+        {'a': None}
+    assert get_previous_timestamps(
+        str(tmp_path / 'missing'), ['a'], 'build') == {'a': None}
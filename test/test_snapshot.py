@@ -0,0 +1,152 @@
+# Copyright 2026 Dirk Thomas
+# Licensed under the Apache License, Version 2.0
+
+import os
+
+from colcon_package_selection.engine import PackageGraph
+from colcon_package_selection.package_selection.graph_snapshot \
+    import GraphSnapshotPackageSelection
+from colcon_package_selection.snapshot import is_snapshot_current
+from colcon_package_selection.snapshot import load_snapshot
+from colcon_package_selection.snapshot import SNAPSHOT_FILENAME
+from colcon_package_selection.snapshot import write_snapshot
+import pytest
+
+FILENAME = SNAPSHOT_FILENAME.format(verb_name='build')
+
+
+@pytest.fixture
+def create_workspace(create_decorators, example_dependencies, tmp_path):
+    def create(dependencies=None):
+        if dependencies is None:
+            dependencies = example_dependencies
+        src = tmp_path / 'src'
+        for name in dependencies.keys():
+            manifest = src / name / 'setup.py'
+            if not manifest.exists():
+                manifest.parent.mkdir(parents=True)
+                manifest.write_text(name)
+        return create_decorators(dependencies, root=src)
+    return create
+
+
+def assert_equal_graphs(graph, other):
+    assert graph.names == other.names
+    assert graph.paths == other.paths
+    assert graph.dependency_indices == other.dependency_indices
+    assert graph.recursive_dependency_indices == \
+        other.recursive_dependency_indices
+    assert graph.depths == other.depths
+
+
+def test_round_trip(create_workspace, tmp_path):
+    graph = PackageGraph.from_decorators(create_workspace())
+    path = tmp_path / FILENAME
+    write_snapshot(path, graph)
+    assert not [p for p in tmp_path.iterdir() if p.name.endswith('.tmp')]
+
+    snapshot = load_snapshot(path)
+    assert snapshot is not None
+    assert_equal_graphs(snapshot, graph)
+    assert snapshot.get_recursive_dependencies('f') == \
+        {'a', 'b', 'c', 'd', 'e'}
+
+
+def test_missing_or_invalid(tmp_path):
+    path = tmp_path / FILENAME
+    assert load_snapshot(path) is None
+    path.write_bytes(b'not a snapshot')
+    assert load_snapshot(path) is None
+
+
+def test_truncated(create_workspace, tmp_path):
+    graph = PackageGraph.from_decorators(create_workspace())
+    path = tmp_path / FILENAME
+    write_snapshot(path, graph)
+    data = path.read_bytes()
+
+    for length in (0, 16, 40, len(data) // 2, len(data) - 1):
+        path.write_bytes(data[:length])
+        assert load_snapshot(path) is None, length
+
+
+def test_stale_signature(create_workspace, tmp_path):
+    graph = PackageGraph.from_decorators(create_workspace())
+    path = tmp_path / FILENAME
+    write_snapshot(path, graph)
+
+    (tmp_path / 'src' / 'c' / 'setup.py').write_text('changed manifest')
+    assert load_snapshot(path) is None
+    assert load_snapshot(path, validate=False) is not None
+
+
+def test_is_snapshot_current(
+    create_workspace, example_dependencies, tmp_path,
+):
+    graph = PackageGraph.from_decorators(create_workspace())
+    path = tmp_path / FILENAME
+    assert not is_snapshot_current(path, graph)
+    write_snapshot(path, graph)
+    assert is_snapshot_current(path, graph)
+
+    # a different graph
+    other = PackageGraph.from_decorators(
+        create_workspace(dict(example_dependencies, c=['a', 'b'])))
+    assert not is_snapshot_current(path, other)
+
+    # a changed manifest
+    (tmp_path / 'src' / 'c' / 'setup.py').write_text('changed manifest')
+    assert not is_snapshot_current(path, graph)
+
+
+def test_extension(
+    create_workspace, example_dependencies, parse_args, tmp_path,
+):
+    extension = GraphSnapshotPackageSelection()
+    build_base = tmp_path / 'build'
+    path = build_base / FILENAME
+
+    decorators = create_workspace()
+    args = parse_args(
+        extension, ['--packages-write-graph-snapshot'],
+        build_base=str(build_base), verb_name='build')
+    extension.select_packages(args, decorators)
+    assert_equal_graphs(
+        load_snapshot(path), PackageGraph.from_decorators(decorators))
+
+    # an up-to-date snapshot isn't being rewritten
+    os.utime(str(path), ns=(0, 0))
+    extension.select_packages(args, create_workspace())
+    assert path.stat().st_mtime_ns == 0
+
+    # a dependency which turns a transitive dependency into a direct one
+    decorators = create_workspace(dict(example_dependencies, c=['a', 'b']))
+    extension.select_packages(args, decorators)
+    assert path.stat().st_mtime_ns != 0
+    assert_equal_graphs(
+        load_snapshot(path), PackageGraph.from_decorators(decorators))
+
+    # each verb writes its own snapshot
+    args.verb_name = 'test'
+    extension.select_packages(args, decorators)
+    assert (build_base / SNAPSHOT_FILENAME.format(verb_name='test')).exists()
+
+
+def test_extension_not_requested(
+    create_decorators, example_dependencies, parse_args, tmp_path,
+):
+    extension = GraphSnapshotPackageSelection()
+    build_base = tmp_path / 'build'
+    args = parse_args(
+        extension, [], build_base=str(build_base), verb_name='build')
+    extension.select_packages(args, create_decorators(example_dependencies))
+    assert not build_base.exists()
+
+
+def test_extension_without_build_base(
+    create_decorators, example_dependencies, parse_args,
+):
+    extension = GraphSnapshotPackageSelection()
+    args = parse_args(extension, ['--packages-write-graph-snapshot'])
+    # nothing to do without a build base
+    extension.select_packages(args, create_decorators(example_dependencies))